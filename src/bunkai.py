@@ -1,9 +1,166 @@
 
 import os
+import json
+import struct
+import gzip
+import bz2
+import lzma
+import queue
+import threading
+import zipfile
+import fnmatch
+import sys
 import pandas as pd
 import numpy as np
 from typing import List
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager, nullcontext
+from multiprocessing import shared_memory
+import energy
 import prime_energy
+import gas
+import kerosene
+
+
+# 解析の結果の列の並び (エネルギー源ごとに用途 × 月の 84 列)
+months = ['1月', '2月', '3月', '4月', '5月', '6月', '7月', '8月', '9月', '10月', '11月', '12月']
+equipments = ['暖房', '冷房', '換気', '照明', '給湯', '家電', '調理']
+energy_sources = ['電気', 'ガス', '灯油', '一次エネルギー']
+
+# 解析の結果の各ブロックの列の範囲, (エネルギー源, 用途) -> slice
+result_blocks = {
+    (source, equipment): slice((i * len(equipments) + j) * len(months), (i * len(equipments) + j + 1) * len(months))
+    for i, source in enumerate(energy_sources)
+    for j, equipment in enumerate(equipments)
+}
+
+# 解析の結果の列名
+result_columns = [
+    (source if source == '一次エネルギー' else source + '_') + equipment + '_' + month
+    for source in energy_sources
+    for equipment in equipments
+    for month in months
+]
+
+n_result_columns = len(result_columns)
+
+
+def get_selected_columns(patterns: List[str]):
+    """列名の glob パターン (例: '一次エネルギー給湯_*') に一致する解析の結果の列
+
+    Args:
+        patterns (List[str]): 列名のパターン. いずれかに一致する列を選ぶ
+
+    Returns:
+        List[int]: 選んだ列の番号 (解析の結果の列の順)
+
+    """
+    selected = np.zeros(n_result_columns, dtype=bool)
+    for pattern in patterns:
+        matched = np.array([fnmatch.fnmatchcase(name, pattern) for name in result_columns])
+        if not matched.any():
+            raise ValueError(pattern)
+        selected |= matched
+
+    return np.flatnonzero(selected).tolist()
+
+
+def get_required_blocks(columns: List[int]):
+    """解析の結果の列を求めるのに必要なブロック
+
+    一次エネルギーのブロックには、同じ用途の電気、ガス、灯油のブロックが必要となる。
+
+    Args:
+        columns (List[int]): 解析の結果の列の番号
+
+    Returns:
+        set: ブロック (エネルギー源, 用途) の集合
+
+    """
+    columns = set(columns)
+    blocks = set()
+    for (source, equipment), block in result_blocks.items():
+        if not columns.isdisjoint(range(block.start, block.stop)):
+            blocks.add((source, equipment))
+            if source == '一次エネルギー':
+                blocks.update((fuel, equipment) for fuel in energy_sources[:3])
+
+    return blocks
+
+
+# 入力ファイルの列名, (区分, 項目) -> 列名 (月別の項目は 12 列の列名のリスト)
+input_columns = {
+    ('general', 'number_of_people'): '世帯の人数',
+    ('general', 'main_habitable_room_floor_area'): '主たる居室の床面積',
+    ('general', 'other_habitable_room_floor_area'): 'その他の居室の床面積',
+    ('general', 'total_floor_area'): '床面積の合計',
+    ('general', 'use_electric'): 'エネルギー源_電気',
+    ('general', 'use_gas'): 'エネルギー源_都市ガス',
+    ('general', 'use_kerosene'): 'エネルギー源_灯油',
+    ('ventilation', 'use'): '電気を換気設備に使用しているかの有無',
+    ('ventilation', 'coeff'): '調整係数_換気',
+    ('hot_water_supply', 'use'): '電気を給湯設備に使用しているかの有無',
+    ('hot_water_supply', 'coeff'): '調整係数_給湯',
+    ('lighting', 'use'): '電気を照明設備に使用しているかの有無',
+    ('lighting', 'coeff'): '調整係数_照明',
+    ('electric_appliance', 'use'): '電気を家電に使用しているかの有無',
+    ('electric_appliance', 'coeff'): '調整係数_家電',
+    ('cooking', 'use'): '電気を調理に使用しているかの有無',
+    ('cooking', 'coeff'): '調整係数_調理',
+    ('electric', 'consumption'): ['電気_kWh_' + m for m in months],
+    ('electric', 'heating'): ['電気_暖房_' + m for m in months],
+    ('electric', 'cooling'): ['電気_冷房_' + m for m in months],
+    ('gas', 'consumption'): ['都市ガス_m3_' + m for m in months],
+    ('gas', 'heating'): ['都市ガス_暖房_' + m for m in months],
+    ('gas', 'gas_type'): 'ガスの種類',
+    ('kerosene', 'consumption'): ['灯油_L_' + m for m in months],
+    ('kerosene', 'heating'): ['灯油_暖房_' + m for m in months],
+}
+
+# 入力ファイルの省略可能な列名, (区分, 項目) -> 列名
+optional_input_columns = {
+    ('general', 'region'): '地域の区分',
+    ('electric', 'f_PE'): '電気の一次エネルギー換算係数',
+    ('gas', 'use_specified_f_PE'): 'ガスの一次エネルギー換算係数の規定値の使用',
+    ('gas', 'f_PE'): 'ガスの一次エネルギー換算係数',
+    ('kerosene', 'use_specified_f_PE'): '灯油の一次エネルギー換算係数の規定値の使用',
+    ('kerosene', 'f_PE'): '灯油の一次エネルギー換算係数',
+}
+
+# 地域の区分の列が無い場合または空欄の場合の地域の区分
+default_region = 6
+
+# 電気の一次エネルギー換算係数の列が無い場合または空欄の場合の換算係数, MJ/kWh
+default_f_PE_E = 9.76
+
+
+def get_column_plan(header):
+    """入力ファイルの見出し行から各項目の列の位置を求める
+
+    Args:
+        header (List[str]): 入力ファイルの列名
+
+    Returns:
+        dict: (区分, 項目) -> 列の位置 (月別の項目は 12 列の位置のリスト). 省略可能な列は有る場合のみ含む
+
+    """
+    index = {}
+    for i, name in enumerate(header):
+        if name in index:
+            raise ValueError(name)
+        index[name] = i
+
+    missing = [name for names in input_columns.values()
+               for name in (names if isinstance(names, list) else [names])
+               if name not in index]
+    if len(missing) > 0:
+        raise ValueError(missing)
+
+    plan = {key: [index[name] for name in names] if isinstance(names, list) else index[names]
+            for key, names in input_columns.items()}
+    plan.update({key: index[name] for key, name in optional_input_columns.items() if name in index})
+
+    return plan
 
 
 def read_csv(filename : str):
@@ -16,212 +173,1709 @@ def read_csv(filename : str):
         List: 解析用のデータ
 
     """
-    csv_rows = pd.read_csv(filename)
+    d = read_csv_batch(filename)
 
     analysis_inputs = []
-    for i, row in csv_rows.iterrows():
+    for i in range(len(d['general']['number_of_people'])):
         analysis_input = {
             'general' : {
-                'number_of_people': row[0],
-                'region': 6,
-                'main_habitable_room_floor_area': row[1],
-                'other_habitable_room_floor_area': row[2],
-                'total_floor_area': row[3],
-                'use_electric': bool(row[4]),
-                'use_gas': bool(row['エネルギー源_都市ガス']),
-                'use_kerosene': bool(row['エネルギー源_灯油'])
-            },
-            'ventilation' : {
-                'use' : bool(row['電気を換気設備に使用しているかの有無']),
-                'coeff' :row['調整係数_換気']
-            },
-            'hot_water_supply' : {
-                'use' : bool(row['電気を給湯設備に使用しているかの有無']),
-                'coeff' :row['調整係数_給湯']
-            },
-            'lighting' : {
-                'use' : bool(row['電気を照明設備に使用しているかの有無']),
-                'coeff' :row['調整係数_照明']
-            },
-            'electric_appliance' : {
-                'use' : bool(row['電気を家電に使用しているかの有無']),
-                'coeff' :row['調整係数_家電']
-            },
-            'cooking' : {
-                'use' : bool(row['電気を調理に使用しているかの有無']),
-                'coeff' :row['調整係数_調理']
+                'number_of_people': int(d['general']['number_of_people'][i]),
+                'region': int(d['general']['region'][i]),
+                'main_habitable_room_floor_area': d['general']['main_habitable_room_floor_area'][i],
+                'other_habitable_room_floor_area': d['general']['other_habitable_room_floor_area'][i],
+                'total_floor_area': d['general']['total_floor_area'][i],
+                'use_electric': bool(d['general']['use_electric'][i]),
+                'use_gas': bool(d['general']['use_gas'][i]),
+                'use_kerosene': bool(d['general']['use_kerosene'][i])
             }
         }
 
-        # 電気の使用が有りの場合
-        if analysis_input['general']['use_electric']:
-            analysis_input['electric'] = {
-                'calorific_value' : 9.76,
-                'consumption' : np.array(row[5:17]),
-                'heating' : np.array(row[17:29]).astype(dtype=bool),
-                'cooling' : np.array(row[29:41]).astype(dtype=bool),
-            }
-
-        # ガスの使用が有りの場合
-        if analysis_input['general']['use_gas']:
-            analysis_input['gas'] = {
-                'calorific_value' : 45.0 if row['ガスの種類'] == '都市ガス' else 100,
-                'consumption' : np.array(row[42:54]),
-                'heating' : np.array(row[54:66]).astype(dtype=bool),
-                'cooling' : np.zeros(12, dtype=bool),
+        for key in ('ventilation', 'hot_water_supply', 'lighting', 'electric_appliance', 'cooking'):
+            analysis_input[key] = {
+                'use' : bool(d[key]['use'][i]),
+                'coeff' : d[key]['coeff'][i]
             }
 
-        # 灯油の使用が有りの場合
-        if analysis_input['general']['use_kerosene']:
-            analysis_input['kerosene'] = {
-                'calorific_value' : 37.0,
-                'consumption' : np.array(row[67:79]),
-                'heating' : np.array(row[79:91]).astype(dtype=bool),
-                'cooling' : np.zeros(12, dtype=bool),
-            }
+        # 使用が有りのエネルギー源
+        for key, use in (('electric', 'use_electric'), ('gas', 'use_gas'), ('kerosene', 'use_kerosene')):
+            if analysis_input['general'][use]:
+                analysis_input[key] = {
+                    'calorific_value' : d[key]['calorific_value'][i],
+                    'consumption' : d[key]['consumption'][i],
+                    'heating' : d[key]['heating'][i],
+                    'cooling' : d[key]['cooling'][i],
+                }
 
         analysis_inputs.append(analysis_input)
 
     return analysis_inputs
 
 
-def analysis(analysis_inputs: List):
-    """解析処理
+# 圧縮の拡張子と形式
+compressions = {'.gz': 'gzip', '.bz2': 'bz2', '.xz': 'xz'}
+
+
+def get_compression(filename : str):
+    """ファイル名の拡張子から圧縮の形式を求める
 
     Args:
-        analysis_inputs (List): 解析用のデータ
+        filename (str): ファイル名
 
     Returns:
-        dataframe: 解析の結果
+        str: 'gzip', 'bz2', 'xz' または None (圧縮なし)
 
     """
-    analysis_results = []
+    return compressions.get(os.path.splitext(filename)[1].lower())
 
-    for d in analysis_inputs:
-        # 電気の使用が有りの場合
-        if d['general']['use_electric'] is True:
-            # 月別の電気の一次エネルギー消費量
-            E_p_E_H, E_p_E_C, E_p_E_V, E_p_E_L, E_p_E_HW, E_p_E_AP, E_p_E_CC = prime_energy.get_E_p_E(
-                p = d['general']['number_of_people'],
-                region = d['general']['region'],
-                A_MR = d['general']['main_habitable_room_floor_area'],
-                A_OR = d['general']['other_habitable_room_floor_area'],
-                A_A = d['general']['total_floor_area'],
-                ele_cos = d['electric']['consumption'],
-                ele_htg_use = d['electric']['heating'],
-                ele_clg_use = d['electric']['cooling'],
-                vnt_use = d['ventilation']['use'],
-                vnt_coeff = d['ventilation']['coeff'],
-                hws_use = d['hot_water_supply']['use'],
-                hws_coeff = d['hot_water_supply']['coeff'],
-                ltg_use = d['lighting']['use'],
-                ltg_coeff = d['lighting']['coeff'],
-                eap_use = d['electric_appliance']['use'],
-                eap_coeff = d['electric_appliance']['coeff'],
-                ckg_use = d['cooking']['use'],
-                ckg_coeff = d['cooking']['coeff'],
-                f_PE_E = d['electric']['calorific_value']
-            )
-        else:
-            E_p_E_H = E_p_E_C = E_p_E_V = E_p_E_L = E_p_E_HW = E_p_E_AP = E_p_E_CC = np.zeros(12)
 
-        # ガスの使用が有りの場合
-        if d['general']['use_gas'] is True:
-            E_p_G_H, E_p_G_C, E_p_G_V, E_p_G_L, E_p_G_HW, E_p_G_AP, E_p_G_CC = prime_energy.get_E_p_G(
-                p = d['general']['number_of_people'],
-                region = d['general']['region'],
-                A_MR = d['general']['main_habitable_room_floor_area'],
-                A_OR = d['general']['other_habitable_room_floor_area'],
-                A_A = d['general']['total_floor_area'],
-                gas_cos = d['gas']['consumption'],
-                gas_htg_use = d['gas']['heating'],
-                gas_clg_use = d['gas']['cooling'],
-                hws_use = d['hot_water_supply']['use'],
-                hws_coeff = d['hot_water_supply']['coeff'],
-                ckg_use = d['cooking']['use'],
-                ckg_coeff = d['cooking']['coeff'],
-                f_PE_G = d['gas']['calorific_value']
-            )
-        else:
-            E_p_G_H = E_p_G_C = E_p_G_V = E_p_G_L = E_p_G_HW = E_p_G_AP = E_p_G_CC = np.zeros(12)
+def get_file_format(filename : str):
+    """ファイル名の拡張子からファイルの形式を求める (圧縮の拡張子は除いて判定する)
 
-        # 灯油の使用が有りの場合
-        if d['general']['use_kerosene'] is True:
-            E_p_K_H, E_p_K_C, E_p_K_V, E_p_K_L, E_p_K_HW, E_p_K_AP, E_p_K_CC = prime_energy.get_E_p_K(
-                p = d['general']['number_of_people'],
-                region = d['general']['region'],
-                A_MR = d['general']['main_habitable_room_floor_area'],
-                A_OR = d['general']['other_habitable_room_floor_area'],
-                A_A = d['general']['total_floor_area'],
-                k_cos = d['kerosene']['consumption'],
-                k_htg_use = d['kerosene']['heating'],
-                k_clg_use = d['kerosene']['cooling'],
-                hws_use = d['hot_water_supply']['use'],
-                hws_coeff = d['hot_water_supply']['coeff'],
-                f_PE_K = d['kerosene']['calorific_value']
-            )
+    圧縮は CSV のみに対応し、その他の形式で圧縮の拡張子が付いている場合は ValueError とする。
+
+    Args:
+        filename (str): ファイル名
+
+    Returns:
+        str: 'csv', 'parquet', 'arrow', 'npy' または 'npz'
+
+    """
+    root, ext = os.path.splitext(filename)
+    if get_compression(filename) is not None:
+        ext = os.path.splitext(root)[1]
+        if ext.lower() in ('.parquet', '.arrow', '.feather', '.npy', '.npz'):
+            raise ValueError(filename)
+    ext = ext.lower()
+    if ext == '.parquet':
+        return 'parquet'
+    elif ext in ('.arrow', '.feather'):
+        return 'arrow'
+    elif ext == '.npy':
+        return 'npy'
+    elif ext == '.npz':
+        return 'npz'
+    else:
+        return 'csv'
+
+
+def read_batch(filename : str):
+    """入力ファイルを列ごとの配列として読み込む (形式は拡張子で判定する)
+
+    Args:
+        filename (str): 入力ファイル名
+
+    Returns:
+        dict: 解析用のデータ (read_csv_batch の戻り値と同じ構成)
+
+    """
+    file_format = get_file_format(filename)
+    if file_format == 'csv':
+        return read_csv_batch(filename)
+    elif file_format in ('parquet', 'arrow'):
+        return read_arrow_batch(filename)
+    else:
+        raise ValueError(filename)
+
+
+def read_batch_chunks(filename : str, chunk_size : int):
+    """入力ファイルを chunk_size 行以下ずつ列ごとの配列として読み込む (形式は拡張子で判定する)
+
+    Args:
+        filename (str): 入力ファイル名
+        chunk_size (int): 一度に読み込む行数
+
+    Yields:
+        dict: 解析用のデータ (read_csv_batch の戻り値と同じ構成)
+
+    """
+    file_format = get_file_format(filename)
+    if file_format == 'csv':
+        return read_csv_batch_chunks(filename, chunk_size)
+    elif file_format in ('parquet', 'arrow'):
+        return read_arrow_batch_chunks(filename, chunk_size)
+    else:
+        raise ValueError(filename)
+
+
+def write_npz_member(zf, name: str, array):
+    """.npz ファイルに配列を 1 つ追加する
+
+    Args:
+        zf (zipfile.ZipFile): 書き込み用に開いた .npz ファイル
+        name (str): 配列の名前
+        array (np.ndarray): 配列
+
+    """
+    with zf.open(name + '.npy', 'w', force_zip64=True) as f:
+        np.lib.format.write_array(f, np.asanyarray(array), allow_pickle=False)
+
+
+def read_npz_member(zf, name: str):
+    """.npz ファイルから配列を 1 つ読み込む
+
+    Args:
+        zf (zipfile.ZipFile): 読み込み用に開いた .npz ファイル
+        name (str): 配列の名前
+
+    Returns:
+        np.ndarray: 配列
+
+    """
+    with zf.open(name + '.npy') as f:
+        return np.lib.format.read_array(f, allow_pickle=False)
+
+
+def mmap_npz_member(filename: str, zf, name: str):
+    """.npz ファイルの配列を 1 つメモリーマップする (圧縮していない場合のみ)
+
+    Args:
+        filename (str): .npz ファイル名
+        zf (zipfile.ZipFile): 読み込み用に開いた .npz ファイル
+        name (str): 配列の名前
+
+    Returns:
+        np.ndarray: 読み込み専用の配列
+
+    """
+    info = zf.getinfo(name + '.npy')
+    if info.compress_type != zipfile.ZIP_STORED:
+        raise ValueError(filename)
+
+    # ローカルファイルヘッダー (30 バイトとファイル名、拡張フィールド) の後に .npy の内容がある
+    with open(filename, 'rb') as f:
+        f.seek(info.header_offset)
+        header = f.read(30)
+        if header[:4] != b'PK\x03\x04':
+            raise ValueError(filename)
+        name_length, extra_length = struct.unpack('<HH', header[26:30])
+        f.seek(info.header_offset + 30 + name_length + extra_length)
+
+        version = np.lib.format.read_magic(f)
+        if version == (1, 0):
+            shape, fortran_order, dtype = np.lib.format.read_array_header_1_0(f)
         else:
-            E_p_K_H = E_p_K_C = E_p_K_V = E_p_K_L = E_p_K_HW = E_p_K_AP = E_p_K_CC = np.zeros(12)
+            shape, fortran_order, dtype = np.lib.format.read_array_header_2_0(f)
+        offset = f.tell()
 
-        # 一次エネルギー消費量
-        E_p_H = prime_energy.get_E_p_H_m(E_p_E_H, E_p_G_H, E_p_K_H)         # (5)
-        E_p_C = prime_energy.get_E_p_C_m(E_p_E_C, E_p_G_C, E_p_K_C)         # (6)
-        E_p_V = prime_energy.get_E_p_V_m(E_p_E_V, E_p_G_V, E_p_K_V)         # (7)
-        E_p_L = prime_energy.get_E_p_L_m(E_p_E_L, E_p_G_L, E_p_K_L)         # (8)
-        E_p_HW = prime_energy.get_E_p_HW_m(E_p_E_HW, E_p_G_HW, E_p_K_HW)     # (9)
-        E_p_AP = prime_energy.get_E_p_AP_m(E_p_E_AP, E_p_G_AP, E_p_K_AP)     # (10)
-        E_p_CC = prime_energy.get_E_p_CC_m(E_p_E_CC, E_p_G_CC, E_p_K_CC)     # (11)
+    if np.prod(shape) == 0:
+        return np.empty(shape, dtype=dtype)
 
-        analysis_result = np.concatenate((
-                        E_p_E_H, E_p_E_C, E_p_E_V, E_p_E_L, E_p_E_HW, E_p_E_AP, E_p_E_CC, \
-                        E_p_G_H, E_p_G_C, E_p_G_V, E_p_G_L, E_p_G_HW, E_p_G_AP, E_p_G_CC, \
-                        E_p_K_H, E_p_K_C, E_p_K_V, E_p_K_L, E_p_K_HW, E_p_K_AP, E_p_K_CC, \
-                        E_p_H, E_p_C, E_p_V, E_p_L, E_p_HW, E_p_AP, E_p_CC
-                    ))
+    return np.memmap(filename, dtype=dtype, mode='r', offset=offset, shape=shape, order='F' if fortran_order else 'C')
 
-        analysis_results.append(analysis_result)
 
-    return analysis_results
+# 入力キャッシュの形式のバージョン (解析用のデータの構成を変えた場合は更新する)
+input_cache_version = 4
 
 
-def generate_analysis_results(output_filename, analysis_results):
-    """解析の結果を出力する
+def get_input_cache_filename(filename : str):
+    """入力キャッシュのファイル名
 
     Args:
-        output_filename (str): 出力ファイル名
-        analysis_results (dataframe): 解析の結果
+        filename (str): 入力ファイル名
 
     Returns:
+        str: 入力キャッシュのファイル名
 
     """
-    # 出力CSVファイルのコラム名作成
-    months = ['1月', '2月', '3月', '4月', '5月', '6月', '7月', '8月', '9月', '10月', '11月', '12月']
-    equipments = ['暖房', '冷房', '換気', '照明', '給湯', '家電', '調理']
+    return filename + '.cache.npz'
 
-    electric_cols = np.array([np.char.add('電気_' + eq + '_', months) for eq in equipments]).flatten()
-    gas_cols = np.array([np.char.add('ガス_' + eq + '_', months) for eq in equipments]).flatten()
-    kerosene_cols = np.array([np.char.add('灯油_' + eq + '_', months) for eq in equipments]).flatten()
-    energy_cols = np.array([np.char.add('一次エネルギー' + eq + '_', months) for eq in equipments]).flatten()
 
-    df = pd.DataFrame(analysis_results, columns = np.concatenate((electric_cols, gas_cols, kerosene_cols, energy_cols)))
+def get_input_cache_key(filename : str):
+    """入力キャッシュのキー (入力ファイルのパス、サイズ、更新時刻、キャッシュの形式のバージョン)
 
-    df.to_csv(output_filename, index=False)
+    Args:
+        filename (str): 入力ファイル名
 
+    Returns:
+        np.ndarray: キー
 
-if __name__ == '__main__':
-    import argparse
+    """
+    stat = os.stat(filename)
+    return np.array([os.path.abspath(filename), str(stat.st_size), str(stat.st_mtime_ns), str(input_cache_version)])
 
-    parser = argparse.ArgumentParser()
-    parser.add_argument('-i', '--input', type=str, help='Input File Path')
-    parser.add_argument('-o', '--output', type=str, help='Output File Path')
 
-    # 入力ファイルの読み込む
-    args = parser.parse_args()
-    input = args.input
-    analysis_data = read_csv(input)
+@contextmanager
+def open_input_cache(filename : str):
+    """入力キャッシュを書き込み用に開く
+
+    書き込みごとに各項目を '<番号>/<グループ>.<項目>' の配列として追記し、全体を保持しない。
+    月別の真偽値の配列は、行ごとに取り出せるよう各行をビット単位に詰めて保存する。
+    途中で中断しても壊れたキャッシュが残らないよう、一時ファイルに書き、閉じる時に置き換える。
+
+    Args:
+        filename (str): 入力ファイル名
+
+    Yields:
+        Callable: 解析用のデータを受け取り、入力キャッシュに追記する関数
+
+    """
+    cache_filename = get_input_cache_filename(filename)
+
+    # キーは読み込む前に求め、読み込み中に入力ファイルが変わった場合はキャッシュが古いとみなされるようにする
+    key = get_input_cache_key(filename)
+
+    try:
+        with zipfile.ZipFile(cache_filename + '.tmp', 'w', allowZip64=True) as zf:
+            write_npz_member(zf, 'key', key)
+            n_chunks = 0
+
+            def write(batch_inputs):
+                nonlocal n_chunks
+                for group, fields in batch_inputs.items():
+                    for field, value in fields.items():
+                        name = '{}/{}.{}'.format(n_chunks, group, field)
+                        if value.dtype == bool and value.ndim == 2:
+                            write_npz_member(zf, name + '.bits', np.packbits(value, axis=1))
+                        else:
+                            write_npz_member(zf, name, value)
+                n_chunks += 1
+
+            yield write
+    except BaseException:
+        if os.path.exists(cache_filename + '.tmp'):
+            os.remove(cache_filename + '.tmp')
+        raise
+
+    os.replace(cache_filename + '.tmp', cache_filename)
+
+
+def save_input_cache(filename : str, batch_inputs: dict):
+    """解析用のデータを入力キャッシュに保存する
+
+    Args:
+        filename (str): 入力ファイル名
+        batch_inputs (dict): 解析用のデータ (read_batch の戻り値)
+
+    """
+    with open_input_cache(filename) as write:
+        write(batch_inputs)
+
+
+def iter_input_cache(filename : str, chunk_size : int = None):
+    """入力キャッシュから解析用のデータを chunk_size 行以下ずつ読み込む
+
+    各項目はメモリーマップし、取り出す行のみを読み込む。
+
+    Args:
+        filename (str): 入力ファイル名
+        chunk_size (int, optional): 一度に読み込む行数. 省略時は書き込んだ単位ごと
+
+    Returns:
+        Iterator[dict]: 解析用のデータ (read_batch の戻り値と同じ構成). キャッシュが無いか古い場合は None
+
+    """
+    cache_filename = get_input_cache_filename(filename)
+
+    # 配列の名前を書き込んだ単位ごとにまとめる (一度だけ走査する)
+    try:
+        with zipfile.ZipFile(cache_filename) as zf:
+            if not np.array_equal(read_npz_member(zf, 'key'), get_input_cache_key(filename)):
+                return None
+
+            chunks = {}
+            for name in zf.namelist():
+                chunk, _, field = name[:-len('.npy')].partition('/')
+                if field:
+                    chunks.setdefault(int(chunk), []).append(field)
+    except (OSError, KeyError, ValueError, zipfile.BadZipFile):
+        return None
+
+    def read_chunks():
+        with zipfile.ZipFile(cache_filename) as zf:
+            for chunk in sorted(chunks):
+                arrays = {name: mmap_npz_member(cache_filename, zf, '{}/{}'.format(chunk, name)) for name in chunks[chunk]}
+                N = len(arrays['general.number_of_people'])
+                step = chunk_size or max(N, 1)
+
+                for start in range(0, max(N, 1), step):
+                    batch_inputs = {}
+                    for name, value in arrays.items():
+                        value = np.array(value[start:start + step])
+                        if name.endswith('.bits'):
+                            group, field, _ = name.split('.')
+                            value = np.unpackbits(value, axis=1, count=12).astype(bool)
+                        else:
+                            group, field = name.split('.')
+                        batch_inputs.setdefault(group, {})[field] = value
+                    yield batch_inputs
+
+    return read_chunks()
+
+
+def load_input_cache(filename : str):
+    """入力キャッシュから解析用のデータを読み込む
+
+    Args:
+        filename (str): 入力ファイル名
+
+    Returns:
+        dict: 解析用のデータ (read_batch の戻り値と同じ構成). キャッシュが無いか古い場合は None
+
+    """
+    chunks = iter_input_cache(filename)
+    if chunks is None:
+        return None
+
+    chunks = list(chunks)
+    if len(chunks) == 1:
+        return chunks[0]
+
+    return {group: {field: np.concatenate([chunk[group][field] for chunk in chunks]) for field in fields}
+            for group, fields in chunks[0].items()}
+
+
+def read_batch_cached(filename : str):
+    """入力キャッシュを使って入力ファイルを列ごとの配列として読み込む
+
+    入力キャッシュが有効であればそれを読み込み、無いか古い場合は入力ファイルを読み込んで入力キャッシュを作る。
+
+    Args:
+        filename (str): 入力ファイル名
+
+    Returns:
+        dict: 解析用のデータ (read_batch の戻り値と同じ構成)
+
+    """
+    batch_inputs = load_input_cache(filename)
+    if batch_inputs is None:
+        batch_inputs = read_batch(filename)
+        save_input_cache(filename, batch_inputs)
+
+    return batch_inputs
+
+
+def read_batch_chunks_cached(filename : str, chunk_size : int):
+    """入力キャッシュを使って入力ファイルを chunk_size 行以下ずつ列ごとの配列として読み込む
+
+    入力キャッシュが有効であればそれを chunk_size 行以下ずつ読み込み、
+    無いか古い場合は入力ファイルを chunk_size 行ずつ読み込みながら入力キャッシュを作る。
+
+    Args:
+        filename (str): 入力ファイル名
+        chunk_size (int): 一度に読み込む行数
+
+    Yields:
+        dict: 解析用のデータ (read_batch の戻り値と同じ構成)
+
+    """
+    chunks = iter_input_cache(filename, chunk_size)
+    if chunks is not None:
+        yield from chunks
+        return
+
+    with open_input_cache(filename) as write:
+        for batch_inputs in read_batch_chunks(filename, chunk_size):
+            write(batch_inputs)
+            yield batch_inputs
+
+
+def read_csv_batch(filename : str):
+    """入力ファイルを列ごとの配列として読み込む
+
+    列の位置は見出し行から求めるため、必要な列が欠けている場合は読み込む前に ValueError とする。
+
+    Args:
+        filename (str): 入力ファイル名
+
+    Returns:
+        dict: 解析用のデータ (read_csv と同じ構成で、各値は全世帯分の配列)
+
+    """
+    csv_rows = pd.read_csv(filename)
+    plan = get_column_plan(csv_rows.columns)
+
+    return get_batch_inputs(lambda index: csv_rows.iloc[:, index].to_numpy(), plan, len(csv_rows))
+
+
+def read_csv_batch_chunks(filename : str, chunk_size : int):
+    """入力ファイルを chunk_size 行ずつ列ごとの配列として読み込む
+
+    Args:
+        filename (str): 入力ファイル名
+        chunk_size (int): 一度に読み込む行数
+
+    Yields:
+        dict: 解析用のデータ (read_csv_batch と同じ構成で、各値は chunk_size 行以下の世帯分の配列)
+
+    """
+    with pd.read_csv(filename, chunksize=chunk_size) as reader:
+        plan = None
+        for csv_rows in reader:
+            if plan is None:
+                plan = get_column_plan(csv_rows.columns)
+            yield get_batch_inputs(lambda index: csv_rows.iloc[:, index].to_numpy(), plan, len(csv_rows))
+
+
+def get_arrow_columns(table):
+    """Arrow のテーブルの列を読み出す関数を作る
+
+    Args:
+        table (pyarrow.Table or pyarrow.RecordBatch): 入力のテーブル
+
+    Returns:
+        Callable: 列の位置 (int または list) を受け取り、その列の値の配列を返す関数
+
+    """
+    def read_columns(index):
+        if isinstance(index, list):
+            return np.stack([read_columns(i) for i in index], axis=-1)
+        return table.column(index).to_numpy(zero_copy_only=False)
+
+    return read_columns
+
+
+def read_arrow_batch(filename : str):
+    """Parquet または Arrow IPC の入力ファイルを列ごとの配列として読み込む
+
+    列名は CSV の入力ファイルと同じとする。
+
+    Args:
+        filename (str): 入力ファイル名
+
+    Returns:
+        dict: 解析用のデータ (read_csv_batch の戻り値と同じ構成)
+
+    """
+    import pyarrow as pa
+
+    if get_file_format(filename) == 'parquet':
+        import pyarrow.parquet as pq
+        table = pq.read_table(filename)
+    else:
+        table = pa.ipc.open_file(pa.memory_map(filename)).read_all()
+
+    plan = get_column_plan(table.column_names)
+
+    return get_batch_inputs(get_arrow_columns(table), plan, table.num_rows)
+
+
+def read_arrow_batch_chunks(filename : str, chunk_size : int):
+    """Parquet または Arrow IPC の入力ファイルを chunk_size 行以下ずつ列ごとの配列として読み込む
+
+    Parquet は行グループ単位で読み込み、Arrow IPC はレコードバッチ単位で読み込む。
+
+    Args:
+        filename (str): 入力ファイル名
+        chunk_size (int): 一度に読み込む行数
+
+    Yields:
+        dict: 解析用のデータ (read_csv_batch の戻り値と同じ構成)
+
+    """
+    import pyarrow as pa
+
+    if get_file_format(filename) == 'parquet':
+        import pyarrow.parquet as pq
+        parquet_file = pq.ParquetFile(filename)
+        plan = get_column_plan(parquet_file.schema_arrow.names)
+        batches = parquet_file.iter_batches(batch_size=chunk_size)
+    else:
+        reader = pa.ipc.open_file(pa.memory_map(filename))
+        plan = get_column_plan(reader.schema.names)
+        batches = (reader.get_batch(i).slice(start, chunk_size)
+                   for i in range(reader.num_record_batches)
+                   for start in range(0, reader.get_batch(i).num_rows, chunk_size))
+
+    for batch in batches:
+        yield get_batch_inputs(get_arrow_columns(batch), plan, batch.num_rows)
+
+
+def get_batch_inputs(read_columns, plan: dict, N: int):
+    """入力ファイルの列から解析用のデータを作る
+
+    Args:
+        read_columns (Callable): 列の位置 (int または list) を受け取り、その列の値の配列を返す関数
+        plan (dict): 各項目の列の位置 (get_column_plan の戻り値)
+        N (int): 世帯数
+
+    Returns:
+        dict: 解析用のデータ (各値は全世帯分の配列)
+
+    """
+    def column(key, dtype):
+        return np.asarray(read_columns(plan[key]), dtype=dtype)
+
+    def flag(key):
+        return column(key, float).astype(bool)
+
+    # 地域の区分 (列が無い場合や空欄は default_region)
+    if ('general', 'region') in plan:
+        region = column(('general', 'region'), float)
+        region = np.where(np.isnan(region), default_region, region)
+        if np.any(region != np.round(region)):
+            raise ValueError(region[region != np.round(region)][0])
+        region = region.astype(int)
+    else:
+        region = np.full(N, default_region)
+
+    # 世帯の人数 (小数や空欄は切り捨てずに ValueError とする)
+    p = column(('general', 'number_of_people'), float)
+    if np.any(p != np.round(p)):
+        raise ValueError(p[p != np.round(p)][0])
+    p = p.astype(int)
+
+    general = {
+        'number_of_people': p,
+        'region': region,
+        'main_habitable_room_floor_area': column(('general', 'main_habitable_room_floor_area'), float),
+        'other_habitable_room_floor_area': column(('general', 'other_habitable_room_floor_area'), float),
+        'total_floor_area': column(('general', 'total_floor_area'), float),
+        'use_electric': flag(('general', 'use_electric')),
+        'use_gas': flag(('general', 'use_gas')),
+        'use_kerosene': flag(('general', 'use_kerosene'))
+    }
+
+    # 指定された一次エネルギー換算係数 (列が無い場合は空欄とする)
+    def f_PE(key):
+        return column((key, 'f_PE'), float) if (key, 'f_PE') in plan else np.full(N, np.nan)
+
+    # 一次エネルギー換算係数の規定値の使用 (列が無い場合は、換算係数が空欄の世帯のみ規定値を使用する)
+    def use_specified_f_PE(key, f_PE):
+        if (key, 'use_specified_f_PE') in plan:
+            return np.asarray(read_columns(plan[key, 'use_specified_f_PE']), dtype=object)
+        return np.where(np.isnan(f_PE), '使用する', '使用しない').astype(object)
+
+    # 計算に用いる一次エネルギー換算係数
+    # 使用していないエネルギー源の換算係数は計算に用いないため、求めずに空欄 (NaN) とする
+    def get_f_PE(use, get_f_PE_batch, *values):
+        rows = general[use]
+        f_PE = np.full(N, np.nan)
+        f_PE[rows] = get_f_PE_batch(*(np.asarray(value)[rows] for value in values))
+        return f_PE
+
+    f_PE_E = f_PE('electric')
+    f_PE_G = f_PE('gas')
+    f_PE_K = f_PE('kerosene')
+
+    return {
+        'general' : general,
+        **{
+            key: {
+                'use' : flag((key, 'use')),
+                'coeff' : column((key, 'coeff'), float)
+            }
+            for key in ('ventilation', 'hot_water_supply', 'lighting', 'electric_appliance', 'cooking')
+        },
+        'electric' : {
+            'calorific_value' : np.where(np.isnan(f_PE_E), default_f_PE_E, f_PE_E),
+            'consumption' : column(('electric', 'consumption'), float),
+            'heating' : flag(('electric', 'heating')),
+            'cooling' : flag(('electric', 'cooling')),
+        },
+        'gas' : {
+            'calorific_value' : get_f_PE('use_gas', gas.get_f_PE_G_batch,
+                                         use_specified_f_PE('gas', f_PE_G), read_columns(plan['gas', 'gas_type']), f_PE_G),
+            'consumption' : column(('gas', 'consumption'), float),
+            'heating' : flag(('gas', 'heating')),
+            'cooling' : np.zeros((N, 12), dtype=bool),
+        },
+        'kerosene' : {
+            'calorific_value' : get_f_PE('use_kerosene', kerosene.get_f_PE_K_batch,
+                                         use_specified_f_PE('kerosene', f_PE_K), f_PE_K),
+            'consumption' : column(('kerosene', 'consumption'), float),
+            'heating' : flag(('kerosene', 'heating')),
+            'cooling' : np.zeros((N, 12), dtype=bool),
+        }
+    }
+
+
+def get_input_namespace(batch_inputs: dict):
+    """入力ファイルの列名から解析用のデータの値への対応 (フィルター式で使う)
+
+    月別の項目は月ごとの列名で参照する。ガスの種類や一次エネルギー換算係数の指定は
+    換算係数 (calorific_value) として読み込むため含めない。
+
+    Args:
+        batch_inputs (dict): 解析用のデータ (read_batch の戻り値)
+
+    Returns:
+        dict: 列名 -> 値の配列, (N,)
+
+    """
+    namespace = {}
+    for (group, field), name in {**input_columns, **optional_input_columns}.items():
+        if field not in batch_inputs[group]:
+            continue
+        values = batch_inputs[group][field]
+        if isinstance(name, list):
+            namespace.update({name_m: values[:, m] for m, name_m in enumerate(name)})
+        else:
+            namespace[name] = values
+
+    return namespace
+
+
+def get_row_mask(batch_inputs: dict, expression: str):
+    """フィルター式に一致する世帯
+
+    式は入力ファイルの列名を変数とし (例: '床面積の合計 > 100 and エネルギー源_都市ガス')、
+    pandas.eval で全世帯分をまとめて評価する。列名以外の名前 (このモジュールの変数など) は使えない。
+
+    Args:
+        batch_inputs (dict): 解析用のデータ (read_batch の戻り値)
+        expression (str): フィルター式
+
+    Returns:
+        np.ndarray: 各世帯が式に一致するか否か, (N,)
+
+    """
+    N = len(batch_inputs['general']['number_of_people'])
+
+    mask = np.asarray(pd.eval(expression, local_dict=get_input_namespace(batch_inputs), global_dict={}, engine='python'))
+    if mask.dtype != bool:
+        raise ValueError(expression)
+
+    return np.broadcast_to(mask, (N,))
+
+
+def analysis(analysis_inputs: List):
+    """解析処理
+
+    Args:
+        analysis_inputs (List): 解析用のデータ
+
+    Returns:
+        dataframe: 解析の結果
+
+    """
+    analysis_results = []
+
+    for d in analysis_inputs:
+        # 調整係数を 1 とした各設備の参照一次エネルギー消費量 (各エネルギー源で共通)
+        E_ref_unit = energy.get_E_ref_unit(
+            p = d['general']['number_of_people'],
+            region = d['general']['region'],
+            A_MR = d['general']['main_habitable_room_floor_area'],
+            A_OR = d['general']['other_habitable_room_floor_area'],
+            A_A = d['general']['total_floor_area']
+        )
+
+        # 電気の使用が有りの場合
+        if d['general']['use_electric'] is True:
+            # 月別の電気の一次エネルギー消費量
+            E_p_E_H, E_p_E_C, E_p_E_V, E_p_E_L, E_p_E_HW, E_p_E_AP, E_p_E_CC = prime_energy.get_E_p_E(
+                p = d['general']['number_of_people'],
+                region = d['general']['region'],
+                A_MR = d['general']['main_habitable_room_floor_area'],
+                A_OR = d['general']['other_habitable_room_floor_area'],
+                A_A = d['general']['total_floor_area'],
+                ele_cos = d['electric']['consumption'],
+                ele_htg_use = d['electric']['heating'],
+                ele_clg_use = d['electric']['cooling'],
+                vnt_use = d['ventilation']['use'],
+                vnt_coeff = d['ventilation']['coeff'],
+                hws_use = d['hot_water_supply']['use'],
+                hws_coeff = d['hot_water_supply']['coeff'],
+                ltg_use = d['lighting']['use'],
+                ltg_coeff = d['lighting']['coeff'],
+                eap_use = d['electric_appliance']['use'],
+                eap_coeff = d['electric_appliance']['coeff'],
+                ckg_use = d['cooking']['use'],
+                ckg_coeff = d['cooking']['coeff'],
+                f_PE_E = d['electric']['calorific_value'],
+                E_ref_unit = E_ref_unit
+            )
+        else:
+            E_p_E_H = E_p_E_C = E_p_E_V = E_p_E_L = E_p_E_HW = E_p_E_AP = E_p_E_CC = np.zeros(12)
+
+        # ガスの使用が有りの場合
+        if d['general']['use_gas'] is True:
+            E_p_G_H, E_p_G_C, E_p_G_V, E_p_G_L, E_p_G_HW, E_p_G_AP, E_p_G_CC = prime_energy.get_E_p_G(
+                p = d['general']['number_of_people'],
+                region = d['general']['region'],
+                A_MR = d['general']['main_habitable_room_floor_area'],
+                A_OR = d['general']['other_habitable_room_floor_area'],
+                A_A = d['general']['total_floor_area'],
+                gas_cos = d['gas']['consumption'],
+                gas_htg_use = d['gas']['heating'],
+                gas_clg_use = d['gas']['cooling'],
+                hws_use = d['hot_water_supply']['use'],
+                hws_coeff = d['hot_water_supply']['coeff'],
+                ckg_use = d['cooking']['use'],
+                ckg_coeff = d['cooking']['coeff'],
+                f_PE_G = d['gas']['calorific_value'],
+                E_ref_unit = E_ref_unit
+            )
+        else:
+            E_p_G_H = E_p_G_C = E_p_G_V = E_p_G_L = E_p_G_HW = E_p_G_AP = E_p_G_CC = np.zeros(12)
+
+        # 灯油の使用が有りの場合
+        if d['general']['use_kerosene'] is True:
+            E_p_K_H, E_p_K_C, E_p_K_V, E_p_K_L, E_p_K_HW, E_p_K_AP, E_p_K_CC = prime_energy.get_E_p_K(
+                p = d['general']['number_of_people'],
+                region = d['general']['region'],
+                A_MR = d['general']['main_habitable_room_floor_area'],
+                A_OR = d['general']['other_habitable_room_floor_area'],
+                A_A = d['general']['total_floor_area'],
+                k_cos = d['kerosene']['consumption'],
+                k_htg_use = d['kerosene']['heating'],
+                k_clg_use = d['kerosene']['cooling'],
+                hws_use = d['hot_water_supply']['use'],
+                hws_coeff = d['hot_water_supply']['coeff'],
+                f_PE_K = d['kerosene']['calorific_value'],
+                E_ref_unit = E_ref_unit
+            )
+        else:
+            E_p_K_H = E_p_K_C = E_p_K_V = E_p_K_L = E_p_K_HW = E_p_K_AP = E_p_K_CC = np.zeros(12)
+
+        # 一次エネルギー消費量
+        E_p_H = prime_energy.get_E_p_H_m(E_p_E_H, E_p_G_H, E_p_K_H)         # (5)
+        E_p_C = prime_energy.get_E_p_C_m(E_p_E_C, E_p_G_C, E_p_K_C)         # (6)
+        E_p_V = prime_energy.get_E_p_V_m(E_p_E_V, E_p_G_V, E_p_K_V)         # (7)
+        E_p_L = prime_energy.get_E_p_L_m(E_p_E_L, E_p_G_L, E_p_K_L)         # (8)
+        E_p_HW = prime_energy.get_E_p_HW_m(E_p_E_HW, E_p_G_HW, E_p_K_HW)     # (9)
+        E_p_AP = prime_energy.get_E_p_AP_m(E_p_E_AP, E_p_G_AP, E_p_K_AP)     # (10)
+        E_p_CC = prime_energy.get_E_p_CC_m(E_p_E_CC, E_p_G_CC, E_p_K_CC)     # (11)
+
+        analysis_result = np.concatenate((
+                        E_p_E_H, E_p_E_C, E_p_E_V, E_p_E_L, E_p_E_HW, E_p_E_AP, E_p_E_CC, \
+                        E_p_G_H, E_p_G_C, E_p_G_V, E_p_G_L, E_p_G_HW, E_p_G_AP, E_p_G_CC, \
+                        E_p_K_H, E_p_K_C, E_p_K_V, E_p_K_L, E_p_K_HW, E_p_K_AP, E_p_K_CC, \
+                        E_p_H, E_p_C, E_p_V, E_p_L, E_p_HW, E_p_AP, E_p_CC
+                    ))
+
+        analysis_results.append(analysis_result)
+
+    return analysis_results
+
+
+def take_rows(batch_inputs: dict, rows):
+    """解析用のデータから一部の世帯を取り出す
+
+    Args:
+        batch_inputs (dict): 解析用のデータ (read_csv_batch の戻り値)
+        rows (slice or np.ndarray): 取り出す世帯の範囲またはインデックス
+
+    Returns:
+        dict: 解析用のデータ (batch_inputs と同じ構成)
+
+    """
+    return {key: take_rows(value, rows) if isinstance(value, dict) else value[rows]
+            for key, value in batch_inputs.items()}
+
+
+def analysis_batch(batch_inputs: dict, out: np.ndarray = None, dtype = np.float64, block_size: int = 65536, order: str = 'C',
+                   blocks: set = None):
+    """解析処理 (全世帯の一括計算)
+
+    analysis と同じ結果を、世帯ごとのループを使わずに配列演算で求める。
+    結果は 1 つの (N, 336) の配列に直接書き込み、途中の計算は block_size 世帯ずつ行う。
+
+    Args:
+        batch_inputs (dict): 解析用のデータ (read_csv_batch の戻り値)
+        out (np.ndarray, optional): 結果の書き込み先, (N, 336). 省略時は dtype で確保する
+        dtype (optional): out を省略した場合の結果の型
+        block_size (int, optional): 一度に計算する世帯数
+        order (str, optional): out を省略した場合の結果の並び ('C': 行優先, 'F': 列優先)
+        blocks (set, optional): 求めるブロック (エネルギー源, 用途) の集合 (get_required_blocks の戻り値).
+            省略時はすべて。求めないブロックには書き込まない (out を省略した場合は 0 とする)
+
+    Returns:
+        np.ndarray: 解析の結果, (N, 336)
+
+    """
+    N = len(batch_inputs['general']['number_of_people'])
+
+    if out is None:
+        out = (np.empty if blocks is None else np.zeros)((N, n_result_columns), dtype=dtype, order=order)
+    elif out.shape != (N, n_result_columns):
+        raise ValueError(out.shape)
+
+    for start in range(0, N, block_size):
+        rows = slice(start, min(start + block_size, N))
+        analysis_block(take_rows(batch_inputs, rows), out[rows], blocks)
+
+    return out
+
+
+def analysis_block(batch_inputs: dict, out: np.ndarray, blocks: set = None):
+    """解析処理 (一部の世帯の一括計算)
+
+    Args:
+        batch_inputs (dict): 解析用のデータ (read_csv_batch の戻り値と同じ構成)
+        out (np.ndarray): 結果の書き込み先, (N, 336)
+        blocks (set, optional): 求めるブロック (エネルギー源, 用途) の集合. 省略時はすべて
+
+    Returns:
+
+    """
+    d = batch_inputs
+    N = len(d['general']['number_of_people'])
+
+    if blocks is None:
+        blocks = set(result_blocks)
+
+    def get_general(d):
+        return dict(
+            p = d['general']['number_of_people'],
+            region = d['general']['region'],
+            A_MR = d['general']['main_habitable_room_floor_area'],
+            A_OR = d['general']['other_habitable_room_floor_area'],
+            A_A = d['general']['total_floor_area'],
+        )
+
+    # 調整係数を 1 とした各設備の参照一次エネルギー消費量 (各エネルギー源で共通)
+    E_ref_unit = energy.get_E_ref_unit_batch(**get_general(d))
+
+    # 月別の電気の一次エネルギー消費量
+    def get_E_p_E(d, E_ref_unit, uses):
+        return prime_energy.get_E_p_E_batch(
+            **get_general(d),
+            ele_cos = d['electric']['consumption'],
+            ele_htg_use = d['electric']['heating'],
+            ele_clg_use = d['electric']['cooling'],
+            vnt_use = d['ventilation']['use'],
+            vnt_coeff = d['ventilation']['coeff'],
+            hws_use = d['hot_water_supply']['use'],
+            hws_coeff = d['hot_water_supply']['coeff'],
+            ltg_use = d['lighting']['use'],
+            ltg_coeff = d['lighting']['coeff'],
+            eap_use = d['electric_appliance']['use'],
+            eap_coeff = d['electric_appliance']['coeff'],
+            ckg_use = d['cooking']['use'],
+            ckg_coeff = d['cooking']['coeff'],
+            f_PE_E = d['electric']['calorific_value'],
+            E_ref_unit = E_ref_unit,
+            uses = uses
+        )
+
+    # 月別のガスの一次エネルギー消費量
+    def get_E_p_G(d, E_ref_unit, uses):
+        return prime_energy.get_E_p_G_batch(
+            **get_general(d),
+            gas_cos = d['gas']['consumption'],
+            gas_htg_use = d['gas']['heating'],
+            gas_clg_use = d['gas']['cooling'],
+            hws_use = d['hot_water_supply']['use'],
+            hws_coeff = d['hot_water_supply']['coeff'],
+            ckg_use = d['cooking']['use'],
+            ckg_coeff = d['cooking']['coeff'],
+            f_PE_G = d['gas']['calorific_value'],
+            E_ref_unit = E_ref_unit,
+            uses = uses
+        )
+
+    # 月別の灯油の一次エネルギー消費量
+    def get_E_p_K(d, E_ref_unit, uses):
+        return prime_energy.get_E_p_K_batch(
+            **get_general(d),
+            k_cos = d['kerosene']['consumption'],
+            k_htg_use = d['kerosene']['heating'],
+            k_clg_use = d['kerosene']['cooling'],
+            hws_use = d['hot_water_supply']['use'],
+            hws_coeff = d['hot_water_supply']['coeff'],
+            f_PE_K = d['kerosene']['calorific_value'],
+            E_ref_unit = E_ref_unit,
+            uses = uses
+        )
+
+    # 各エネルギー源を使用している世帯のみ計算し、使用していない世帯は 0 とする (求めない用途は None)
+    E_p = {}
+    for source, use, get_E_p in (('電気', 'use_electric', get_E_p_E),
+                                 ('ガス', 'use_gas', get_E_p_G),
+                                 ('灯油', 'use_kerosene', get_E_p_K)):
+        uses = [j for j, equipment in enumerate(equipments) if (source, equipment) in blocks]
+        if len(uses) == 0:
+            E_p[source] = [None] * len(equipments)
+            continue
+
+        rows = np.flatnonzero(d['general'][use])
+        if len(rows) == N:
+            E_p[source] = list(get_E_p(d, E_ref_unit, uses))
+        else:
+            E_p[source] = [np.zeros((N, 12)) if j in uses else None for j in range(len(equipments))]
+            if len(rows) > 0:
+                for E, E_rows in zip(E_p[source], get_E_p(take_rows(d, rows), E_ref_unit[rows], uses)):
+                    if E is not None:
+                        E[rows] = E_rows
+
+    # 一次エネルギー消費量 式(5)～(11)
+    E_p['一次エネルギー'] = [E_p_E_X + E_p_G_X + E_p_K_X if ('一次エネルギー', equipment) in blocks else None
+                          for (equipment, E_p_E_X, E_p_G_X, E_p_K_X) in zip(equipments, E_p['電気'], E_p['ガス'], E_p['灯油'])]
+
+    for source, E_p_X in E_p.items():
+        for equipment, E in zip(equipments, E_p_X):
+            if (source, equipment) in blocks:
+                out[:, result_blocks[source, equipment]] = E
+
+
+def analysis_shared(batch_inputs: dict, name: str, shape, dtype, order: str, start: int, stop: int, blocks: set = None):
+    """解析処理 (共有メモリ上の結果への書き込み)
+
+    analysis_batch_parallel の各プロセスで実行し、結果を共有メモリの start 行目から stop 行目の手前までに書き込む。
+
+    Args:
+        batch_inputs (dict): 解析用のデータ (start 行目から stop 行目の手前までの世帯分)
+        name (str): 結果の共有メモリの名前
+        shape (tuple): 結果全体の形, (N, 336)
+        dtype: 結果の型
+        order (str): 結果の並び ('C': 行優先, 'F': 列優先)
+        start (int): 書き込む先頭の行
+        stop (int): 書き込む末尾の次の行
+        blocks (set, optional): 求めるブロック (エネルギー源, 用途) の集合. 省略時はすべて
+
+    Returns:
+
+    """
+    shm = shared_memory.SharedMemory(name=name)
+    try:
+        out = np.ndarray(shape, dtype=dtype, buffer=shm.buf, order=order)
+        analysis_batch(batch_inputs, out=out[start:stop], blocks=blocks)
+        del out
+    finally:
+        shm.close()
+
+
+# analysis_batch_parallel で 1 つのプロセスに渡す最小の世帯数
+min_rows_per_range = 2048
+
+
+def get_rows_text(row_index, max_runs: int = 10):
+    """行番号の並びをエラーの表示用の文字列にする (連続する行は 'a to b' とまとめる)
+
+    Args:
+        row_index (np.ndarray): 行番号, (M,)
+        max_runs (int, optional): 表示する連続した行の範囲の最大数 (超える分は '...' とする)
+
+    Returns:
+        str: 行番号の文字列 (例: '150 to 152, 160')
+
+    """
+    row_index = np.sort(row_index)
+    runs = np.split(row_index, np.flatnonzero(np.diff(row_index) != 1) + 1)
+    texts = [str(run[0]) if len(run) == 1 else '{} to {}'.format(run[0], run[-1]) for run in runs[:max_runs]]
+    if len(runs) > max_runs:
+        texts.append('...')
+    return ', '.join(texts)
+
+
+def get_failed_rows(batch_inputs: dict, blocks: set = None):
+    """1 世帯ずつ解析し、失敗する世帯を求める (エラーの表示に使う)
+
+    Args:
+        batch_inputs (dict): 解析用のデータ
+        blocks (set, optional): 求めるブロック (エネルギー源, 用途) の集合. 省略時はすべて
+
+    Returns:
+        List[int]: 失敗した世帯の位置
+
+    """
+    failed = []
+    for i in range(len(batch_inputs['general']['number_of_people'])):
+        try:
+            analysis_batch(take_rows(batch_inputs, slice(i, i + 1)), blocks=blocks)
+        except Exception:
+            failed.append(i)
+    return failed
+
+
+@contextmanager
+def analysis_batch_parallel(batch_inputs: dict, workers: int, dtype = np.float64, row_index: np.ndarray = None, order: str = 'C',
+                            blocks: set = None, executor: ProcessPoolExecutor = None):
+    """解析処理 (複数のプロセスによる一括計算)
+
+    世帯を行の範囲ごとに分割して workers 個のプロセスで analysis_batch を行う。
+    各プロセスは共有メモリ上の結果の自身の行の範囲に直接書き込むため、結果はプロセス間で受け渡さない。
+    with 文で使い、結果の配列は with ブロックの中でのみ有効とする。
+    チャンクごとに呼び出す場合は、プロセスの起動を繰り返さないよう executor を渡す。
+
+    Args:
+        batch_inputs (dict): 解析用のデータ (read_csv_batch の戻り値)
+        workers (int): プロセス数
+        dtype (optional): 結果の型
+        row_index (np.ndarray, optional): batch_inputs の各世帯の入力ファイルでの行番号, (N,) (エラーの表示に使う).
+            省略時は 0 からの連番
+        order (str, optional): 結果の並び ('C': 行優先, 'F': 列優先)
+        blocks (set, optional): 求めるブロック (エネルギー源, 用途) の集合. 省略時はすべて (求めないブロックは 0 とする)
+        executor (ProcessPoolExecutor, optional): 使用するプロセスプール (workers 個のプロセス). 省略時は呼び出しごとに作る
+
+    Yields:
+        np.ndarray: 解析の結果, (N, 336)
+
+    """
+    if workers < 1:
+        raise ValueError(workers)
+
+    N = len(batch_inputs['general']['number_of_people'])
+    shape = (N, n_result_columns)
+    dtype = np.dtype(dtype)
+
+    if row_index is None:
+        row_index = np.arange(N)
+
+    # 処理時間の偏りを均すため、プロセス数より細かく分割する
+    # (世帯数が少ない範囲は計算より受け渡しの時間が長くなるため、min_rows_per_range 世帯以上とする)
+    n_ranges = max(1, min(N // min_rows_per_range, workers * 4))
+    bounds = np.linspace(0, N, n_ranges + 1).astype(int)
+
+    shm = shared_memory.SharedMemory(create=True, size=max(1, N * n_result_columns * dtype.itemsize))
+    try:
+        with ProcessPoolExecutor(max_workers=workers) if executor is None else nullcontext(executor) as executor:
+            futures = [
+                (start, stop, executor.submit(analysis_shared, take_rows(batch_inputs, slice(start, stop)),
+                                              shm.name, shape, dtype, order, start, stop, blocks))
+                for start, stop in zip(bounds[:-1], bounds[1:])
+            ]
+
+            for start, stop, future in futures:
+                try:
+                    future.result()
+                except Exception as e:
+                    # 範囲内で失敗した世帯を特定する (特定できない場合は範囲全体とする)
+                    failed = get_failed_rows(take_rows(batch_inputs, slice(start, stop)), blocks)
+                    failed = row_index[start:stop][failed] if len(failed) > 0 else row_index[start:stop]
+                    raise RuntimeError('rows {} failed'.format(get_rows_text(failed))) from e
+
+        out = np.ndarray(shape, dtype=dtype, buffer=shm.buf, order=order)
+        try:
+            yield out
+        finally:
+            del out
+    finally:
+        shm.close()
+        shm.unlink()
+
+
+def get_household_signatures(batch_inputs: dict):
+    """各世帯の計算に用いる入力を正規化した値の並び
+
+    使用していないエネルギー源の消費量等は結果に影響しないため 0 とし、ガスの種類は発熱量として含める。
+    NaN はすべて同じ値に揃える。
+
+    Args:
+        batch_inputs (dict): 解析用のデータ (read_batch の戻り値)
+
+    Returns:
+        np.ndarray: 各世帯の入力の値, (N, K)
+
+    """
+    d = batch_inputs
+
+    def fuel(key, use):
+        use = d['general'][use][:, None]
+        return [np.where(use, x[:, None] if x.ndim == 1 else x, 0) for x in (
+            d[key]['calorific_value'], d[key]['consumption'], d[key]['heating'], d[key]['cooling'])]
+
+    signatures = np.concatenate([
+        np.stack([d['general'][key] for key in (
+            'number_of_people', 'region', 'main_habitable_room_floor_area', 'other_habitable_room_floor_area',
+            'total_floor_area', 'use_electric', 'use_gas', 'use_kerosene')], axis=1).astype(float),
+        *[np.stack([d[key]['use'], d[key]['coeff']], axis=1).astype(float)
+          for key in ('ventilation', 'hot_water_supply', 'lighting', 'electric_appliance', 'cooking')],
+        *fuel('electric', 'use_electric'),
+        *fuel('gas', 'use_gas'),
+        *fuel('kerosene', 'use_kerosene'),
+    ], axis=1, dtype=float)
+
+    return np.where(np.isnan(signatures), np.nan, signatures)
+
+
+def get_unique_households(batch_inputs: dict):
+    """計算に用いる入力が同じ世帯をまとめる
+
+    Args:
+        batch_inputs (dict): 解析用のデータ (read_batch の戻り値)
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: 入力が異なる世帯の代表の行, (U,) と、各世帯の代表の番号, (N,)
+
+    """
+    signatures = np.ascontiguousarray(get_household_signatures(batch_inputs))
+    rows = signatures.view(np.dtype((np.void, signatures.shape[1] * signatures.itemsize))).reshape(-1)
+    _, index, inverse = np.unique(rows, return_index=True, return_inverse=True)
+
+    return index, inverse.reshape(-1)
+
+
+def analysis_batch_dedup(batch_inputs: dict, analyze, dtype = np.float64, order: str = 'C', stats: dict = None):
+    """解析処理 (入力が同じ世帯をまとめた一括計算)
+
+    入力が同じ世帯は代表の 1 世帯のみを analyze で計算し、その結果を同じ入力のすべての世帯に割り当てる。
+
+    Args:
+        batch_inputs (dict): 解析用のデータ (read_batch の戻り値)
+        analyze (Callable): 代表の世帯の解析用のデータと、その各世帯の batch_inputs での位置, (U,) を受け取り、
+            結果, (U, 336) を返すコンテキストマネージャーを返す関数
+        dtype (optional): 結果の型
+        order (str, optional): 結果の並び ('C': 行優先, 'F': 列優先)
+        stats (dict, optional): 'rows', 'unique_rows' にこの計算での件数を加える
+
+    Returns:
+        np.ndarray: 解析の結果, (N, 336)
+
+    """
+    index, inverse = get_unique_households(batch_inputs)
+    N = len(inverse)
+    out = np.empty((N, n_result_columns), dtype=dtype, order=order)
+
+    if N > 0:
+        with analyze(take_rows(batch_inputs, index), index) as analysis_results:
+            out[:] = analysis_results[inverse]
+
+    if stats is not None:
+        stats['rows'] = stats.get('rows', 0) + N
+        stats['unique_rows'] = stats.get('unique_rows', 0) + len(index)
+
+    return out
+
+
+def generate_analysis_results(output_filename, analysis_results, float_format: str = None):
+    """解析の結果を出力する
+
+    Args:
+        output_filename (str): 出力ファイル名
+        analysis_results (np.ndarray): 解析の結果, (N, 336)
+        float_format (str, optional): CSV の数値の書式 (例: '%.3f'). 省略時は最短の往復可能な表記
+
+    Returns:
+
+    """
+    with open_analysis_results(output_filename, analysis_results.dtype, float_format) as write:
+        write(analysis_results)
+
+
+def write_csv_rows(write, analysis_results: np.ndarray, float_format: str = None, block_size: int = 8192):
+    """解析の結果を CSV の行として書き込む
+
+    DataFrame.to_csv(header=False, index=False) と同じ内容を書き込む (NaN は空欄)。
+    値を 1 行ずつの書式文字列でまとめて書式化し、値がすべて 0.0 の 12 か月のブロックは書式化済みの文字列を使う。
+
+    Args:
+        write (Callable): 文字列を出力先に書き込む関数
+        analysis_results (np.ndarray): 解析の結果, (N, 336) (一部の列を選んだ (N, K) でもよい)
+        float_format (str, optional): 数値の書式 (例: '%.3f'). 省略時は最短の往復可能な表記
+        block_size (int, optional): 一度に書式化する行数
+
+    Returns:
+
+    """
+    if float_format is not None:
+        slot, to_list = float_format, lambda X: X.tolist()
+    elif analysis_results.dtype == np.float64:
+        slot, to_list = '%r', lambda X: X.tolist()
+    else:
+        # float64 以外は numpy の表記とする (DataFrame.to_csv と同じ)
+        slot, to_list = '%s', lambda X: X.astype(str).tolist()
+
+    # 列数が 12 の倍数でない場合は行全体を 1 つのブロックとする
+    n_months = len(months) if analysis_results.shape[1] % len(months) == 0 else analysis_results.shape[1]
+    # 書式化済みの 0.0 は行の書式文字列に埋め込むため、% を %% にする
+    zero_text = ','.join([slot % to_list(np.zeros(1, dtype=analysis_results.dtype))[0]] * n_months).replace('%', '%%')
+    value_text = ','.join([slot] * n_months)
+
+    for start in range(0, len(analysis_results), block_size):
+        X = analysis_results[start:start + block_size]
+        n = len(X)
+
+        # 各行の値がすべて 0.0 (-0.0 を除く) のブロックの組合せ, NaN を含む行は -1
+        is_zero = ((X == 0) & ~np.signbit(X)).reshape(n, -1, n_months).all(axis=2)
+        keys = (is_zero.astype(np.int64) << np.arange(is_zero.shape[1])).sum(axis=1)
+        is_nan = np.isnan(X)
+        keys[is_nan.any(axis=1)] = -1
+
+        lines = [None] * n
+        order = np.argsort(keys, kind='stable')
+        groups = np.split(order, np.flatnonzero(np.diff(keys[order])) + 1)
+        for rows in groups:
+            if len(rows) == 0:
+                continue
+
+            if keys[rows[0]] < 0:
+                for i, x, m in zip(rows.tolist(), to_list(X[rows]), is_nan[rows].tolist()):
+                    lines[i] = ','.join('' if m_j else slot % x_j for x_j, m_j in zip(x, m)) + '\n'
+                continue
+
+            zero_blocks = is_zero[rows[0]]
+            template = ','.join(zero_text if z else value_text for z in zero_blocks) + '\n'
+            values = to_list(X[rows][:, np.repeat(~zero_blocks, n_months)])
+            for i, x in zip(rows.tolist(), values):
+                lines[i] = template % tuple(x)
+
+        write(''.join(lines))
+
+
+@contextmanager
+def open_text_output(output_filename, max_pending: int = 4):
+    """文字列を書き込む出力ファイルを開く
+
+    拡張子が .gz, .bz2, .xz の場合は圧縮して書き込む。エンコードと圧縮、書き込みは別のスレッドで行い、
+    呼び出し側の計算と並行させる (未処理の文字列は max_pending 個まで)。
+
+    Args:
+        output_filename (str): 出力ファイル名
+        max_pending (int, optional): 書き込み待ちの文字列の最大数
+
+    Yields:
+        Callable: 文字列を受け取り、出力ファイルに書き込む関数
+
+    """
+    compression = get_compression(output_filename)
+    if compression == 'gzip':
+        f = gzip.open(output_filename, 'wb', compresslevel=6)
+    elif compression == 'bz2':
+        f = bz2.open(output_filename, 'wb')
+    elif compression == 'xz':
+        f = lzma.open(output_filename, 'wb')
+    else:
+        f = open(output_filename, 'wb')
+
+    pending = queue.Queue(maxsize=max_pending)
+    errors = []
+
+    def run():
+        while True:
+            text = pending.get()
+            if text is None:
+                break
+            if len(errors) == 0:
+                try:
+                    f.write(text.encode('utf-8'))
+                except Exception as e:
+                    errors.append(e)
+
+    def write(text):
+        if len(errors) > 0:
+            raise errors[0]
+        pending.put(text)
+
+    thread = threading.Thread(target=run, daemon=True)
+    thread.start()
+    with f:
+        try:
+            yield write
+        finally:
+            pending.put(None)
+            thread.join()
+
+    if len(errors) > 0:
+        raise errors[0]
+
+
+def get_npy_header(shape, dtype, size: int = 128):
+    """.npy ファイルのヘッダーを作る
+
+    行数によらず同じ長さとなるよう、size バイトまで空白で埋める。
+
+    Args:
+        shape (tuple): 配列の形
+        dtype: 配列の型
+        size (int, optional): ヘッダーの長さ (64 の倍数)
+
+    Returns:
+        bytes: ヘッダー
+
+    """
+    header = repr({'descr': np.lib.format.dtype_to_descr(np.dtype(dtype)), 'fortran_order': False, 'shape': tuple(shape)})
+
+    # マジックナンバーとバージョン (8 バイト), ヘッダー長 (2 バイト) を除いた長さ
+    header = header.ljust(size - 10 - 1) + '\n'
+
+    return np.lib.format.magic(1, 0) + struct.pack('<H', len(header)) + header.encode('latin1')
+
+
+def get_result_layout(n_rows: int, dtype, columns: List[int] = None):
+    """解析の結果の配列の構成 (.npy 出力のサイドカー)
+
+    Args:
+        n_rows (int): 行数 (世帯数)
+        dtype: 解析の結果の型
+        columns (List[int], optional): 出力した列の番号. 省略時はすべての列
+
+    Returns:
+        dict: 配列の形と型、列名、(エネルギー源, 用途) ごとの列の範囲 [開始, 終了)
+            (一部の列を選んだ場合は 12 か月がすべて揃うブロックのみ)
+
+    """
+    if columns is None:
+        columns = range(n_result_columns)
+    position = {j: i for i, j in enumerate(columns)}
+
+    blocks = {}
+    for (source, equipment), block in result_blocks.items():
+        if all(j in position for j in range(block.start, block.stop)):
+            blocks.setdefault(source, {})[equipment] = [position[block.start], position[block.start] + len(months)]
+
+    return {
+        'shape': [n_rows, len(position)],
+        'dtype': np.dtype(dtype).str,
+        'columns': [result_columns[j] for j in columns],
+        'blocks': blocks,
+    }
+
+
+# 簡略形式で行ごとに有無を持つエネルギー源, (保存時の名前, エネルギー源)
+compact_sources = [('electric', '電気'), ('gas', 'ガス'), ('kerosene', '灯油')]
+
+
+def get_source_columns(source: str):
+    """エネルギー源の 84 列 (用途 × 月) の列の範囲
+
+    Args:
+        source (str): エネルギー源
+
+    Returns:
+        slice: 列の範囲
+
+    """
+    return slice(result_blocks[source, equipments[0]].start, result_blocks[source, equipments[-1]].stop)
+
+
+def get_compact_results(analysis_results):
+    """解析の結果を簡略形式にする
+
+    電気、ガス、灯油の 84 列がすべて 0.0 の行はそのブロックを持たず、行ごとのビットマスク
+    (電気 = 1, ガス = 2, 灯油 = 4) で有無を表す。一次エネルギーは float64 であれば
+    展開時に電気、ガス、灯油の和として同じ値を求め直せるため持たない。
+
+    Args:
+        analysis_results (ndarray): 解析の結果 (N, 336)
+
+    Returns:
+        dict: 'fuels' (N,) のビットマスクと、エネルギー源ごとに有る行だけの結果 (M, 84)
+            (float64 以外では一次エネルギーの結果 'primary' (N, 84) も持つ)
+
+    """
+    X = analysis_results
+    compact = {'fuels': np.zeros(len(X), dtype=np.uint8)}
+
+    for bit, (name, source) in enumerate(compact_sources):
+        block = X[:, get_source_columns(source)]
+        # -0.0 と NaN は 0.0 と区別して残す
+        present = ~((block == 0) & ~np.signbit(block)).all(axis=1)
+        compact['fuels'] |= present.astype(np.uint8) << bit
+        compact[name] = np.ascontiguousarray(block[present])
+
+    if X.dtype != np.float64:
+        compact['primary'] = np.ascontiguousarray(X[:, get_source_columns('一次エネルギー')])
+
+    return compact
+
+
+def concat_compact_results(compacts):
+    """簡略形式の解析の結果を行方向に連結する
+
+    Args:
+        compacts (List[dict]): 簡略形式の解析の結果 (get_compact_results の戻り値)
+
+    Returns:
+        dict: 連結した簡略形式の解析の結果
+
+    """
+    return {key: np.concatenate([compact[key] for compact in compacts]) for key in compacts[0]}
+
+
+def expand_compact_results(compact, start: int = 0, stop: int = None):
+    """簡略形式の解析の結果のうち [start, stop) の行を元の形に戻す
+
+    Args:
+        compact (dict): 簡略形式の解析の結果 (get_compact_results の戻り値)
+        start (int, optional): 開始行
+        stop (int, optional): 終了行 (省略時は最後の行まで)
+
+    Returns:
+        ndarray: 解析の結果 (stop - start, 336)
+
+    """
+    fuels = compact['fuels']
+    if stop is None:
+        stop = len(fuels)
+
+    out = np.zeros((stop - start, n_result_columns), dtype=compact['electric'].dtype)
+
+    for bit, (name, source) in enumerate(compact_sources):
+        present = (fuels >> bit) & 1 == 1
+        first = np.count_nonzero(present[:start])
+        rows = np.flatnonzero(present[start:stop])
+        out[rows, get_source_columns(source)] = compact[name][first:first + len(rows)]
+
+    P = out[:, get_source_columns('一次エネルギー')]
+    if 'primary' in compact:
+        P[:] = compact['primary'][start:stop]
+    else:
+        # 解析時と同じ順に足す
+        np.add(out[:, get_source_columns('電気')], out[:, get_source_columns('ガス')], out=P)
+        np.add(P, out[:, get_source_columns('灯油')], out=P)
+
+    return out
+
+
+@contextmanager
+def open_compact_results(filename: str):
+    """簡略形式の解析の結果を順に書き込む .npz ファイルを開く
+
+    書き込みごとに '<番号>/fuels', '<番号>/electric' などの配列として追記し、全体を保持しない。
+
+    Args:
+        filename (str): 保存先のファイル名
+
+    Yields:
+        Callable: 簡略形式の解析の結果を受け取り、.npz ファイルに追記する関数
+
+    """
+    with zipfile.ZipFile(filename, 'w', allowZip64=True) as zf:
+        write_npz_member(zf, 'columns', np.array(result_columns))
+        n_chunks = 0
+
+        def write(compact):
+            nonlocal n_chunks
+            for key, value in compact.items():
+                write_npz_member(zf, '{}/{}'.format(n_chunks, key), value)
+            n_chunks += 1
+
+        yield write
+
+
+def save_compact_results(filename: str, compact):
+    """簡略形式の解析の結果を .npz ファイルに保存する
+
+    Args:
+        filename (str): 保存先のファイル名
+        compact (dict): 簡略形式の解析の結果
+
+    """
+    with open_compact_results(filename) as write:
+        write(compact)
+
+
+def iter_compact_results(filename: str):
+    """.npz ファイルから簡略形式の解析の結果を書き込んだ単位ごとに読み込む
+
+    Args:
+        filename (str): .npz ファイル名
+
+    Yields:
+        dict: 簡略形式の解析の結果
+
+    """
+    with zipfile.ZipFile(filename) as zf:
+        if list(read_npz_member(zf, 'columns')) != result_columns:
+            raise ValueError(filename)
+
+        # 配列の名前を書き込んだ単位ごとにまとめる (一度だけ走査する)
+        chunks = {}
+        for name in zf.namelist():
+            chunk, _, key = name[:-len('.npy')].partition('/')
+            if key:
+                chunks.setdefault(int(chunk), []).append(key)
+
+        for chunk in sorted(chunks):
+            yield {key: read_npz_member(zf, '{}/{}'.format(chunk, key)) for key in chunks[chunk]}
+
+
+def load_compact_results(filename: str):
+    """.npz ファイルから簡略形式の解析の結果を読み込む
+
+    Args:
+        filename (str): .npz ファイル名
+
+    Returns:
+        dict: 簡略形式の解析の結果 (全体を連結したもの)
+
+    """
+    return concat_compact_results(list(iter_compact_results(filename)))
+
+
+@contextmanager
+def open_analysis_results(output_filename, dtype = np.float64, float_format: str = None, columns: List[int] = None):
+    """解析の結果を順に書き込む出力ファイルを開く
+
+    出力の形式は拡張子で判定する (CSV, Parquet, Arrow IPC, .npy, .npz)。見出し行またはスキーマは開いた時に一度だけ書き、
+    以降は書き込むたびに行を追記する。Parquet は書き込みごとに行グループとなる。
+    .npy は行優先の配列とし、列名と各ブロックの列の範囲を '<出力ファイル名>.json' に書く。
+    .npz は簡略形式 (get_compact_results) とし、書き込みごとに追記する (すべての列を出力する場合のみ)。
+
+    Args:
+        output_filename (str): 出力ファイル名
+        dtype (optional): 解析の結果の型 (Parquet, Arrow IPC のスキーマに使う)
+        float_format (str, optional): CSV の数値の書式 (例: '%.3f'). 省略時は最短の往復可能な表記
+        columns (List[int], optional): 出力する列の番号 (get_selected_columns の戻り値). 省略時はすべての列
+
+    Yields:
+        Callable: 解析の結果 (M, 336) を受け取り、出力ファイルに追記する関数
+
+    """
+    file_format = get_file_format(output_filename)
+
+    names = result_columns if columns is None else [result_columns[j] for j in columns]
+
+    def select(analysis_results):
+        return analysis_results if columns is None else analysis_results[:, columns]
+
+    if file_format == 'csv':
+        with open_text_output(output_filename) as write_text:
+            write_text(','.join(names) + '\n')
+
+            def write(analysis_results):
+                write_csv_rows(write_text, select(analysis_results), float_format)
+
+            yield write
+    elif file_format == 'npy':
+        with open(output_filename, 'wb') as f:
+            # 行数は書き終えるまで分からないため、ヘッダーの領域を確保しておき最後に書き直す
+            f.write(get_npy_header((0, len(names)), dtype))
+            n_rows = 0
+
+            def write(analysis_results):
+                nonlocal n_rows
+                f.write(np.ascontiguousarray(select(analysis_results), dtype=dtype).data)
+                n_rows += len(analysis_results)
+
+            yield write
+
+            f.seek(0)
+            f.write(get_npy_header((n_rows, len(names)), dtype))
+
+        with open(output_filename + '.json', 'w', encoding='utf-8') as f:
+            json.dump(get_result_layout(n_rows, dtype, columns), f, ensure_ascii=False, indent=1)
+    elif file_format == 'npz':
+        if columns is not None:
+            raise ValueError(output_filename)
+
+        with open_compact_results(output_filename) as write_compact:
+            n_writes = 0
+
+            def write(analysis_results):
+                nonlocal n_writes
+                write_compact(get_compact_results(np.asarray(analysis_results, dtype=dtype)))
+                n_writes += 1
+
+            yield write
+
+            # 書き込みが無い場合も、型が分かるよう 0 行の結果を書く
+            if n_writes == 0:
+                write(np.empty((0, n_result_columns), dtype=dtype))
+    else:
+        import pyarrow as pa
+
+        schema = pa.schema([(name, pa.from_numpy_dtype(np.dtype(dtype))) for name in names])
+
+        if file_format == 'parquet':
+            import pyarrow.parquet as pq
+            writer = pq.ParquetWriter(output_filename, schema)
+        else:
+            writer = pa.ipc.new_file(output_filename, schema)
+
+        def write(analysis_results):
+            # 列優先の配列であれば各列をコピーせずに渡す
+            X = select(analysis_results)
+            writer.write_table(pa.Table.from_arrays(
+                [pa.array(X[:, j]) for j in range(len(names))], schema=schema))
+
+        try:
+            yield write
+        finally:
+            writer.close()
+
+
+if __name__ == '__main__':
+    import argparse
+
+    parser = argparse.ArgumentParser()
+    parser.add_argument('-i', '--input', type=str, help='Input File Path')
+    parser.add_argument('-o', '--output', type=str, help='Output File Path')
+    parser.add_argument('--dtype', type=str, default='float64', choices=['float64', 'float32'], help='Result Data Type')
+    parser.add_argument('--chunk-size', type=int, default=None, help='Number of Rows Processed at Once')
+    parser.add_argument('--workers', type=int, default=1, help='Number of Worker Processes')
+    parser.add_argument('--input-cache', action='store_true', help='Cache the Parsed Input Next to the Input File')
+    parser.add_argument('--dedup', action='store_true', help='Compute Households with Identical Inputs Only Once')
+    parser.add_argument('--where', type=str, default=None,
+                        help='Row Filter Expression over Input Column Names (e.g. "床面積の合計 > 100")')
+    parser.add_argument('--columns', '--select', type=str, action='append', default=None,
+                        help='Output Column Name Patterns, Comma Separated (e.g. 一次エネルギー給湯_*)')
+    precision = parser.add_mutually_exclusive_group()
+    precision.add_argument('--float-format', type=str, default=None, help='CSV Number Format (e.g. %%.3f)')
+    precision.add_argument('--decimals', type=int, default=None, help='CSV Number of Decimal Places')
+
+    args = parser.parse_args()
+    input = args.input
+
+    float_format = args.float_format
+    if float_format is not None:
+        # 出力ファイルを開く前に、数値 1 つを書式化できるか確かめる
+        try:
+            float_format % 0.0
+        except (TypeError, ValueError) as e:
+            parser.error('argument --float-format: invalid format {!r} ({})'.format(float_format, e))
+    if args.decimals is not None:
+        if args.decimals < 0:
+            raise ValueError(args.decimals)
+        float_format = '%.{}f'.format(args.decimals)
+
+    # 出力する列を選んだ場合は、それらの列に必要なブロックのみ求める
+    columns = None
+    blocks = None
+    if args.columns is not None:
+        columns = get_selected_columns([pattern for value in args.columns for pattern in value.split(',')])
+        blocks = get_required_blocks(columns)
+
+    # Parquet, Arrow IPC は列ごとに書き出すため、結果を列優先で持つ
+    order = 'F' if get_file_format(args.output) in ('parquet', 'arrow') else 'C'
+
+    # 簡略形式 (.npz) の解析の結果を入力とした場合は、書き込んだ単位ごとに block_size 行ずつ展開して書き出すのみとする
+    if get_file_format(input) == 'npz':
+        if args.where is not None:
+            raise ValueError(args.where)
+        compacts = iter_compact_results(input)
+        compact = next(compacts)
+        block_size = args.chunk_size or 65536
+        with open_analysis_results(args.output, compact['electric'].dtype, float_format, columns) as write:
+            while compact is not None:
+                N = len(compact['fuels'])
+                for start in range(0, max(N, 1), block_size):
+                    write(np.asarray(expand_compact_results(compact, start, min(start + block_size, N)), order=order))
+                compact = next(compacts, None)
+        sys.exit()
+
+    stats = {}
+
+    # row_index は analysis_data の各世帯の入力ファイルでの行番号 (エラーの表示に使う)
+    def compute(analysis_data, row_index, dtype = args.dtype):
+        if args.dedup:
+            return nullcontext(analysis_batch_dedup(
+                analysis_data, lambda d, rows: compute_all(d, row_index[rows], dtype), dtype=dtype, order=order, stats=stats))
+        return compute_all(analysis_data, row_index, dtype)
+
+    def compute_all(analysis_data, row_index, dtype = args.dtype):
+        if args.workers == 1:
+            return nullcontext(analysis_batch(analysis_data, dtype=dtype, order=order, blocks=blocks))
+        return analysis_batch_parallel(analysis_data, args.workers, dtype=dtype, row_index=row_index, order=order, blocks=blocks,
+                                       executor=executor)
+
+    # 入力ファイルの読み込む (chunk_size を指定した場合は chunk_size 行ずつ読み込む)
+    # 入力キャッシュも chunk_size 行ずつ読み書きし、全体を保持しない
+    if args.chunk_size is not None and args.chunk_size < 1:
+        raise ValueError(args.chunk_size)
+
+    if args.chunk_size is None:
+        chunks = [read_batch_cached(input) if args.input_cache else read_batch(input)]
+    elif args.input_cache:
+        chunks = read_batch_chunks_cached(input, args.chunk_size)
+    else:
+        chunks = read_batch_chunks(input, args.chunk_size)
+
+    # 解析し、結果を出力する (プロセスプールはすべてのチャンクで共用する)
+    with ProcessPoolExecutor(max_workers=args.workers) if args.workers > 1 else nullcontext() as executor:
+        with open_analysis_results(args.output, args.dtype, float_format, columns) as write:
+            row_offset = 0
+            for analysis_data in chunks:
+                n_rows = len(analysis_data['general']['number_of_people'])
+                row_index = row_offset + np.arange(n_rows)
+
+                # フィルター式に一致しない世帯は解析せず、出力もしない
+                if args.where is not None:
+                    rows = np.flatnonzero(get_row_mask(analysis_data, args.where))
+                    analysis_data = take_rows(analysis_data, rows)
+                    row_index = row_index[rows]
+                    stats['input_rows'] = stats.get('input_rows', 0) + n_rows
+                    stats['selected_rows'] = stats.get('selected_rows', 0) + len(rows)
 
-    # 解析する
-    analysis_results = analysis(analysis_data)
+                with compute(analysis_data, row_index) as analysis_results:
+                    write(analysis_results)
+                row_offset += n_rows
 
-    # 解析の結果を出力する
-    generate_analysis_results(args.output, analysis_results)
+    # 実行の概要
+    if 'input_rows' in stats:
+        print('where: {} of {} rows selected'.format(stats['selected_rows'], stats['input_rows']), file=sys.stderr)
+    if 'rows' in stats:
+        print('dedup: {} rows, {} unique ({:.1%} of rows computed)'.format(
+            stats['rows'], stats['unique_rows'], stats['unique_rows'] / stats['rows'] if stats['rows'] > 0 else 0.0), file=sys.stderr)
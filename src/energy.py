@@ -313,947 +313,1221 @@ def calc_E_CC_ref_m(
     return ref_CC * C_CC
 
 
-def get_E_ref(p, region, A_MR, A_OR, A_A,
-              C_V, C_L, C_HW, C_AP, C_CC):
-    """各設備の参照一次エネルギー消費量
-
-    Args:
-        p (int): 世帯の人数,
-        region (int): 地域の区分
-        A_MR (float): 主たる居室の床面積
-        A_OR (bool): その他の居室の床面積
-        A_A (bool): 床面積の合計
-        C_V (bool): 換気設備の調整係数
-        C_L (bool): 照明設備の調整係数
-        C_HW (bool): 給湯設備の調整係数
-        C_AP (bool): 家電設備の調整係数
-        C_CC (bool): 調理設備の調整係数
-
-    Returns:
-        tuple: 各設備の参照一次エネルギー消費量
-
-    """
-
-    # 表2a 係数α_(V,m)
-    coeff_alpha_V_m = [
-        2.87553024,
-        2.59725312,
-        2.87553024,
-        2.7827712,
-        2.87553024,
-        2.7827712,
-        2.87553024,
-        2.87553024,
-        2.7827712,
-        2.87553024,
-        2.7827712,
-        2.87553024
+# 表2a 係数α_(V,m)
+coeff_alpha_V_m = [
+    2.87553024,
+    2.59725312,
+    2.87553024,
+    2.7827712,
+    2.87553024,
+    2.7827712,
+    2.87553024,
+    2.87553024,
+    2.7827712,
+    2.87553024,
+    2.7827712,
+    2.87553024
+]
+
+# 表2b 係数 𝛽𝑉,𝑚 MJ
+coeff_beta_V_m = {
+    1: [
+        11.0890192,
+        9.9743296,
+        11.0890192,
+        10.5689088,
+        10.7698672,
+        10.6953984,
+        11.155192,
+        11.0559328,
+        10.5689088,
+        10.9294432,
+        10.7615712,
+        10.9294432
+    ],
+    2: [
+        22.1551024,
+        19.9277728,
+        22.1551024,
+        21.1146864,
+        21.5150416,
+        21.368544,
+        22.287448,
+        22.0889296,
+        21.1146864,
+        21.835072,
+        21.5008896,
+        21.835072
+    ],
+    3: [
+        33.2506608,
+        29.9079584,
+        33.2506608,
+        31.6898416,
+        32.2912528,
+        32.0701888,
+        33.4493744,
+        33.151304,
+        31.6898416,
+        32.7709568,
+        32.2689024,
+        32.7709568
+    ],
+    4: [
+        44.3076672,
+        39.8532032,
+        44.3076672,
+        42.2268352,
+        43.0273504,
+        42.7345504,
+        44.5725536,
+        44.175224,
+        42.2268352,
+        43.6675088,
+        42.9994368,
+        43.6675088
+    ],
+}
+
+# 表 3a 係数𝛼𝐿,𝑚
+coeff_alpha_L_m = {
+    1: [
+        4.412,
+        3.916,
+        4.412,
+        4.328,
+        4.429,
+        4.102,
+        4.846,
+        4.194,
+        4.328,
+        4.42,
+        4.536,
+        4.42
+    ],
+    2: [
+        9.194,
+        8.256,
+        9.194,
+        8.741,
+        8.878,
+        8.845,
+        9.302,
+        9.139,
+        8.741,
+        9.036,
+        8.953,
+        9.036
+    ],
+    3: [
+        10.262,
+        9.219,
+        10.262,
+        9.737,
+        9.881,
+        9.888,
+        10.339,
+        10.223,
+        9.737,
+        10.071,
+        9.966,
+        10.071
+    ],
+    4: [
+        11.33,
+        10.182,
+        11.33,
+        10.732,
+        10.884,
+        10.932,
+        11.376,
+        11.306,
+        10.732,
+        11.107,
+        10.978,
+        11.107
+    ]
+}
+
+# 表 3b 係数𝛽𝐿,𝑚
+coeff_beta_L_m = {
+    1: [
+        0.229,
+        0.206,
+        0.229,
+        0.226,
+        0.235,
+        0.219,
+        0.235,
+        0.226,
+        0.226,
+        0.232,
+        0.226,
+        0.232
+    ],
+    2: [
+        0.471,
+        0.426,
+        0.471,
+        0.451,
+        0.464,
+        0.458,
+        0.464,
+        0.474,
+        0.451,
+        0.468,
+        0.451,
+        0.468
+    ],
+    3: [
+        2.216,
+        1.98,
+        2.216,
+        2.131,
+        2.169,
+        2.102,
+        2.321,
+        2.163,
+        2.131,
+        2.192,
+        2.207,
+        2.192
+    ],
+    4: [
+        3.961,
+        3.534,
+        3.961,
+        3.811,
+        3.873,
+        3.746,
+        4.178,
+        3.852,
+        3.811,
+        3.917,
+        3.964,
+        3.917
+    ]
+}
+
+# 表 3c 係数𝛾𝐿,𝑚
+coeff_gamma_L_m = {
+    1: [
+        0.925,
+        0.833,
+        0.925,
+        0.92,
+        0.964,
+        0.882,
+        0.964,
+        0.906,
+        0.92,
+        0.945,
+        0.92,
+        0.945
+    ],
+    2: [
+        2.219,
+        2.006,
+        2.219,
+        2.129,
+        2.192,
+        2.158,
+        2.188,
+        2.234,
+        2.129,
+        2.205,
+        2.127,
+        2.205
+    ],
+    3: [
+        2.9,
+        2.613,
+        2.9,
+        2.785,
+        2.857,
+        2.799,
+        2.917,
+        2.892,
+        2.785,
+        2.878,
+        2.815,
+        2.878
+    ],
+    4: [
+        3.582,
+        3.219,
+        3.582,
+        3.441,
+        3.522,
+        3.44,
+        3.646,
+        3.55,
+        3.441,
+        3.552,
+        3.503,
+        3.552
     ]
+}
+
+# 表 3d 係数𝛿𝐿,𝑚
+coeff_delta_L_m = {
+    1: [
+        54.52,
+        48.65,
+        54.52,
+        53.82,
+        55.58,
+        51.11,
+        58.89,
+        52.34,
+        53.82,
+        55.05,
+        55.47,
+        55.0
+    ],
+    2: [
+        121.51,
+        109.4,
+        121.51,
+        116.08,
+        118.58,
+        117.32,
+        121.98,
+        121.28,
+        116.08,
+        120.04,
+        117.78,
+        120.04
+    ],
+    3: [
+        172.18,
+        154.65,
+        172.18,
+        164.4,
+        167.46,
+        165.48,
+        174.75,
+        170.9,
+        164.4,
+        169.82,
+        168.05,
+        169.82
+    ],
+    4: [
+        222.85,
+        199.9,
+        222.85,
+        212.72,
+        216.34,
+        213.65,
+        227.51,
+        220.52,
+        212.72,
+        219.59,
+        218.31,
+        219.59
+    ]
+}
 
-    # 表2b 係数 𝛽𝑉,𝑚 MJ
-    coeff_beta_V_m = {
+# 表4 給湯の一次エネルギー消費量
+ref_HW = {
+    1: {
         1: [
-            11.0890192,
-            9.9743296,
-            11.0890192,
-            10.5689088,
-            10.7698672,
-            10.6953984,
-            11.155192,
-            11.0559328,
-            10.5689088,
-            10.9294432,
-            10.7615712,
-            10.9294432
+            1277.1,
+            1139.1,
+            1251.8,
+            1027.9,
+            924.3,
+            819.9,
+            815.6,
+            706.7,
+            778.9,
+            943.5,
+            1064.5,
+            1199.9
         ],
         2: [
-            22.1551024,
-            19.9277728,
-            22.1551024,
-            21.1146864,
-            21.5150416,
-            21.368544,
-            22.287448,
-            22.0889296,
-            21.1146864,
-            21.835072,
-            21.5008896,
-            21.835072
+            1261.8,
+            1130.5,
+            1247.1,
+            1004.4,
+            908.2,
+            826.0,
+            787.3,
+            687.9,
+            739.5,
+            906.5,
+            1040.6,
+            1162.5
         ],
         3: [
-            33.2506608,
-            29.9079584,
-            33.2506608,
-            31.6898416,
-            32.2912528,
-            32.0701888,
-            33.4493744,
-            33.151304,
-            31.6898416,
-            32.7709568,
-            32.2689024,
-            32.7709568
+            1172.1,
+            1051.0,
+            1115.4,
+            940.5,
+            834.7,
+            759.6,
+            752.8,
+            662.6,
+            699.4,
+            861.3,
+            979.9,
+            1073.8
         ],
         4: [
-            44.3076672,
-            39.8532032,
-            44.3076672,
-            42.2268352,
-            43.0273504,
-            42.7345504,
-            44.5725536,
-            44.175224,
-            42.2268352,
-            43.6675088,
-            42.9994368,
-            43.6675088
+            1138.0,
+            1134.3,
+            1110.2,
+            915.0,
+            799.6,
+            726.0,
+            724.9,
+            624.4,
+            680.9,
+            827.6,
+            958.3,
+            1047.6
         ],
-    }
-
-    # 表 3a 係数𝛼𝐿,𝑚
-    coeff_alpha_L_m = {
-        1: [
-            4.412,
-            3.916,
-            4.412,
-            4.328,
-            4.429,
-            4.102,
-            4.846,
-            4.194,
-            4.328,
-            4.42,
-            4.536,
-            4.42
+        5: [
+            1213.6,
+            1096.0,
+            1154.8,
+            908.7,
+            755.0,
+            681.3,
+            639.5,
+            549.2,
+            591.8,
+            789.7,
+            954.1,
+            1135.7
         ],
-        2: [
-            9.194,
-            8.256,
-            9.194,
-            8.741,
-            8.878,
-            8.845,
-            9.302,
-            9.139,
-            8.741,
-            9.036,
-            8.953,
-            9.036
+        6: [
+            1129.8,
+            1006.9,
+            1080.2,
+            829.8,
+            709.6,
+            582.4,
+            524.3,
+            449.6,
+            532.7,
+            700.8,
+            871.8,
+            1008.1
+
         ],
-        3: [
-            10.262,
-            9.219,
-            10.262,
-            9.737,
-            9.881,
-            9.888,
-            10.339,
-            10.223,
-            9.737,
-            10.071,
-            9.966,
-            10.071
+        7: [
+            1024.0,
+            901.6,
+            958.5,
+            732.3,
+            638.5,
+            545.3,
+            465.6,
+            423.5,
+            459.8,
+            636.1,
+            814.7,
+            919.0
+
         ],
-        4: [
-            11.33,
-            10.182,
-            11.33,
-            10.732,
-            10.884,
-            10.932,
-            11.376,
-            11.306,
-            10.732,
-            11.107,
-            10.978,
-            11.107
+        8: [
+            699.5,
+            636.5,
+            696.8,
+            585.7,
+            522.3,
+            487.1,
+            459.7,
+            431.7,
+            435.9,
+            496.5,
+            585.5,
+            644.1
         ]
-    }
-
-    # 表 3b 係数𝛽𝐿,𝑚
-    coeff_beta_L_m = {
+    },
+    2: {
         1: [
-            0.229,
-            0.206,
-            0.229,
-            0.226,
-            0.235,
-            0.219,
-            0.235,
-            0.226,
-            0.226,
-            0.232,
-            0.226,
-            0.232
+            2049.2,
+            1826.3,
+            1999.1,
+            1628.5,
+            1460.5,
+            1287.9,
+            1281.9,
+            1103,
+            1230.4,
+            1496.4,
+            1697.9,
+            1918.4
         ],
         2: [
-            0.471,
-            0.426,
-            0.471,
-            0.451,
-            0.464,
-            0.458,
-            0.464,
-            0.474,
-            0.451,
-            0.468,
-            0.451,
-            0.468
+            2014.5,
+            1803.2,
+            1987.7,
+            1592.6,
+            1435.8,
+            1296.3,
+            1231.8,
+            1070.7,
+            1167.7,
+            1435.4,
+            1657.8,
+            1854.2
         ],
         3: [
-            2.216,
-            1.98,
-            2.216,
-            2.131,
-            2.169,
-            2.102,
-            2.321,
-            2.163,
-            2.131,
-            2.192,
-            2.207,
-            2.192
+            1866.8,
+            1674.0,
+            1775.7,
+            1490.4,
+            1318.4,
+            1188.1,
+            1175.1,
+            1027.1,
+            1098.9,
+            1364.3,
+            1560.6,
+            1714.0
         ],
         4: [
-            3.961,
-            3.534,
-            3.961,
-            3.811,
-            3.873,
-            3.746,
-            4.178,
-            3.852,
-            3.811,
-            3.917,
-            3.964,
-            3.917
-        ]
-    }
-
-    # 表 3c 係数𝛾𝐿,𝑚
-    coeff_gamma_L_m = {
-        1: [
-            0.925,
-            0.833,
-            0.925,
-            0.92,
-            0.964,
-            0.882,
-            0.964,
-            0.906,
-            0.92,
-            0.945,
-            0.92,
-            0.945
+            1811.0,
+            1646.9,
+            1767.0,
+            1445.7,
+            1260.1,
+            1132.9,
+            1131.1,
+            966.6,
+            1070.1,
+            1309.3,
+            1524.7,
+            1669.6
         ],
-        2: [
-            2.219,
-            2.006,
-            2.219,
-            2.129,
-            2.192,
-            2.158,
-            2.188,
-            2.234,
-            2.129,
-            2.205,
-            2.127,
-            2.205
+        5: [
+            1902.2,
+            1719.1,
+            1812.5,
+            1429.0,
+            1188.1,
+            1069.5,
+            1004.5,
+            863.3,
+            934.4,
+            1246.6,
+            1505.3,
+            1785.7
         ],
-        3: [
-            2.9,
-            2.613,
-            2.9,
-            2.785,
-            2.857,
-            2.799,
-            2.917,
-            2.892,
-            2.785,
-            2.878,
-            2.815,
-            2.878
+        6: [
+            1772.9,
+            1581.8,
+            1697.6,
+            1305.3,
+            1116.5,
+            914.2,
+            825.6,
+            710.2,
+            841.2,
+            1108.3,
+            1376.8,
+            1591.1
         ],
-        4: [
-            3.582,
-            3.219,
-            3.582,
-            3.441,
-            3.522,
-            3.44,
-            3.646,
-            3.55,
-            3.441,
-            3.552,
-            3.503,
-            3.552
+        7: [
+            1610.9,
+            1421.5,
+            1510.2,
+            1155.0,
+            1008.6,
+            859.0,
+            738.8,
+            671.7,
+            731.6,
+            1009.7,
+            1288.5,
+            1451.4
+        ],
+        8: [
+            1106.7,
+            1008.0,
+            1104.4,
+            925.7,
+            826.3,
+            767.0,
+            726.9,
+            682.0,
+            690.1,
+            786.5,
+            928.0,
+            1021.9
         ]
-    }
-
-    # 表 3d 係数𝛿𝐿,𝑚
-    coeff_delta_L_m = {
+    },
+    3: {
         1: [
-            54.52,
-            48.65,
-            54.52,
-            53.82,
-            55.58,
-            51.11,
-            58.89,
-            52.34,
-            53.82,
-            55.05,
-            55.47,
-            55.0
+            3031.3,
+            2709.7,
+            2932.9,
+            2425.6,
+            2194.4,
+            1932.9,
+            1880.4,
+            1655.4,
+            1838.5,
+            2232.5,
+            2512.4,
+            2855.1
         ],
         2: [
-            121.51,
-            109.4,
-            121.51,
-            116.08,
-            118.58,
-            117.32,
-            121.98,
-            121.28,
-            116.08,
-            120.04,
-            117.78,
-            120.04
+            2978.6,
+            2674.9,
+            2916.4,
+            2374.1,
+            2157.9,
+            1942.3,
+            1810.4,
+            1608.9,
+            1746.6,
+            2142.2,
+            2452.3,
+            2762.2
         ],
         3: [
-            172.18,
-            154.65,
-            172.18,
-            164.4,
-            167.46,
-            165.48,
-            174.75,
-            170.9,
-            164.4,
-            169.82,
-            168.05,
-            169.82
+            2764.8,
+            2486.5,
+            2610.9,
+            2224.1,
+            1985.8,
+            1783.0,
+            1728.0,
+            1540.9,
+            1645.1,
+            2037.0,
+            2311.4,
+            2556.5
         ],
         4: [
-            222.85,
-            199.9,
-            222.85,
-            212.72,
-            216.34,
-            213.65,
-            227.51,
-            220.52,
-            212.72,
-            219.59,
-            218.31,
-            219.59
-        ]
-    }
-
-    # 表4 給湯の一次エネルギー消費量
-    ref_HW = {
-        1: {
-            1: [
-                1277.1,
-                1139.1,
-                1251.8,
-                1027.9,
-                924.3,
-                819.9,
-                815.6,
-                706.7,
-                778.9,
-                943.5,
-                1064.5,
-                1199.9
-            ],
-            2: [
-                1261.8,
-                1130.5,
-                1247.1,
-                1004.4,
-                908.2,
-                826.0,
-                787.3,
-                687.9,
-                739.5,
-                906.5,
-                1040.6,
-                1162.5
-            ],
-            3: [
-                1172.1,
-                1051.0,
-                1115.4,
-                940.5,
-                834.7,
-                759.6,
-                752.8,
-                662.6,
-                699.4,
-                861.3,
-                979.9,
-                1073.8
-            ],
-            4: [
-                1138.0,
-                1134.3,
-                1110.2,
-                915.0,
-                799.6,
-                726.0,
-                724.9,
-                624.4,
-                680.9,
-                827.6,
-                958.3,
-                1047.6
-            ],
-            5: [
-                1213.6,
-                1096.0,
-                1154.8,
-                908.7,
-                755.0,
-                681.3,
-                639.5,
-                549.2,
-                591.8,
-                789.7,
-                954.1,
-                1135.7
-            ],
-            6: [
-                1129.8,
-                1006.9,
-                1080.2,
-                829.8,
-                709.6,
-                582.4,
-                524.3,
-                449.6,
-                532.7,
-                700.8,
-                871.8,
-                1008.1
-
-            ],
-            7: [
-                1024.0,
-                901.6,
-                958.5,
-                732.3,
-                638.5,
-                545.3,
-                465.6,
-                423.5,
-                459.8,
-                636.1,
-                814.7,
-                919.0
-
-            ],
-            8: [
-                699.5,
-                636.5,
-                696.8,
-                585.7,
-                522.3,
-                487.1,
-                459.7,
-                431.7,
-                435.9,
-                496.5,
-                585.5,
-                644.1
-            ]
-        },
-        2: {
-            1: [
-                2049.2,
-                1826.3,
-                1999.1,
-                1628.5,
-                1460.5,
-                1287.9,
-                1281.9,
-                1103,
-                1230.4,
-                1496.4,
-                1697.9,
-                1918.4
-            ],
-            2: [
-                2014.5,
-                1803.2,
-                1987.7,
-                1592.6,
-                1435.8,
-                1296.3,
-                1231.8,
-                1070.7,
-                1167.7,
-                1435.4,
-                1657.8,
-                1854.2
-            ],
-            3: [
-                1866.8,
-                1674.0,
-                1775.7,
-                1490.4,
-                1318.4,
-                1188.1,
-                1175.1,
-                1027.1,
-                1098.9,
-                1364.3,
-                1560.6,
-                1714.0
-            ],
-            4: [
-                1811.0,
-                1646.9,
-                1767.0,
-                1445.7,
-                1260.1,
-                1132.9,
-                1131.1,
-                966.6,
-                1070.1,
-                1309.3,
-                1524.7,
-                1669.6
-            ],
-            5: [
-                1902.2,
-                1719.1,
-                1812.5,
-                1429.0,
-                1188.1,
-                1069.5,
-                1004.5,
-                863.3,
-                934.4,
-                1246.6,
-                1505.3,
-                1785.7
-            ],
-            6: [
-                1772.9,
-                1581.8,
-                1697.6,
-                1305.3,
-                1116.5,
-                914.2,
-                825.6,
-                710.2,
-                841.2,
-                1108.3,
-                1376.8,
-                1591.1
-            ],
-            7: [
-                1610.9,
-                1421.5,
-                1510.2,
-                1155.0,
-                1008.6,
-                859.0,
-                738.8,
-                671.7,
-                731.6,
-                1009.7,
-                1288.5,
-                1451.4
-            ],
-            8: [
-                1106.7,
-                1008.0,
-                1104.4,
-                925.7,
-                826.3,
-                767.0,
-                726.9,
-                682.0,
-                690.1,
-                786.5,
-                928.0,
-                1021.9
-            ]
-        },
-        3: {
-            1: [
-                3031.3,
-                2709.7,
-                2932.9,
-                2425.6,
-                2194.4,
-                1932.9,
-                1880.4,
-                1655.4,
-                1838.5,
-                2232.5,
-                2512.4,
-                2855.1
-            ],
-            2: [
-                2978.6,
-                2674.9,
-                2916.4,
-                2374.1,
-                2157.9,
-                1942.3,
-                1810.4,
-                1608.9,
-                1746.6,
-                2142.2,
-                2452.3,
-                2762.2
-            ],
-            3: [
-                2764.8,
-                2486.5,
-                2610.9,
-                2224.1,
-                1985.8,
-                1783.0,
-                1728.0,
-                1540.9,
-                1645.1,
-                2037.0,
-                2311.4,
-                2556.5
-            ],
-            4: [
-                2685.6,
-                2448.4,
-                2596.2,
-                2158.0,
-                1897.6,
-                1700.7,
-                1660.6,
-                1449.2,
-                1600.3,
-                1957.4,
-                2257.5,
-                2490.1
-            ],
-            5: [
-                2853.4,
-                2584.8,
-                2696.1,
-                2153.6,
-                1806.8,
-                1620.1,
-                1488.6,
-                1305.6,
-                1411.7,
-                1883.6,
-                2253.3,
-                2691.7
-            ],
-            6: [
-                2660.1,
-                2378.9,
-                2526.9,
-                1969.0,
-                1700.1,
-                1386.2,
-                1222.9,
-                1073.8,
-                1273.7,
-                1678.5,
-                2061.5,
-                2403.1
-            ],
-            7: [
-                2417.2,
-                2138.7,
-                2248.7,
-                1747.0,
-                1538.1,
-                1303.8,
-                1093.0,
-                1018.4,
-                1108.0,
-                1529.1,
-                1930.1,
-                2196.1
-            ],
-            8: [
-                1668.1,
-                1522.5,
-                1648.1,
-                1400.8,
-                1258.8,
-                1159.7,
-                1076.6,
-                1031.0,
-                1041.1,
-                1189.9,
-                1395.2,
-                1550.2
-            ]
-        },
-        4: {
-            1: [
-                3377.2,
-                3021.8,
-                3267.5,
-                2710.3,
-                2456.3,
-                2163.7,
-                2097.3,
-                1854.1,
-                2056.9,
-                2496.7,
-                2803.2,
-                3187.1
-            ],
-            2: [
-                3319.7,
-                2983.9,
-                3249.4,
-                2653.7,
-                2415.6,
-                2173.8,
-                2018.7,
-                1801.5,
-                1954.3,
-                2395.7,
-                2736.7,
-                3084.8
-            ],
-            3: [
-                3084.6,
-                2776.0,
-                2912.6,
-                2486.9,
-                2224.0,
-                1996.0,
-                1926.5,
-                1727.2,
-                1841.0,
-                2278.5,
-                2580.8,
-                2857.6
-            ],
-            4: [
-                2997.5,
-                2734.1,
-                2896.0,
-                2412.8,
-                2125.0,
-                1904.1,
-                1853.3,
-                1626.4,
-                1791.4,
-                2190.0,
-                2520.8,
-                2784.2
-            ],
-            5: [
-                3211.2,
-                2910.5,
-                3031.3,
-                2425.0,
-                2037.1,
-                1825.2,
-                1671.2,
-                1473.9,
-                1589.9,
-                2122.0,
-                2533.8,
-                3033.1
-            ],
-            6: [
-                2994.4,
-                2679.2,
-                2841.1,
-                2217.1,
-                1916.9,
-                1561.0,
-                1376.9,
-                1215.4,
-                1434.7,
-                1891.2,
-                2317.5,
-                2708.8
-            ],
-            7: [
-                2720.5,
-                2408.5,
-                2528.0,
-                1967.8,
-                1734.9,
-                1469.3,
-                1231.4,
-                1153.1,
-                1250.3,
-                1723.0,
-                2169.6,
-                2475.9
-            ],
-            8: [
-                1877.3,
-                1714.4,
-                1852.7,
-                1577.1,
-                1421.2,
-                1309.9,
-                1213.4,
-                1167.3,
-                1177.8,
-                1343.4,
-                1568.2,
-                1747.1
-            ]
-        }
-
-    }
-
-    # 表5 家電の参照一次エネルギー消費量
-    ref_AP = {
-        1: [
-            849.7,
-            765.3,
-            849.7,
-            815.6,
-            836.1,
-            819.9,
-            854.6,
-            847.2,
-            815.6,
-            842.9,
-            824.9,
-            842.9
+            2685.6,
+            2448.4,
+            2596.2,
+            2158.0,
+            1897.6,
+            1700.7,
+            1660.6,
+            1449.2,
+            1600.3,
+            1957.4,
+            2257.5,
+            2490.1
         ],
-        2: [
-            1031.2,
-            928.7,
-            1031.2,
-            988.7,
-            1012.5,
-            995.1,
-            1037.2,
-            1028.3,
-            988.7,
-            1021.9,
-            1001.0,
-            1021.9
+        5: [
+            2853.4,
+            2584.8,
+            2696.1,
+            2153.6,
+            1806.8,
+            1620.1,
+            1488.6,
+            1305.6,
+            1411.7,
+            1883.6,
+            2253.3,
+            2691.7
         ],
-        3: [
-            1409.4,
-            1268.9,
-            1409.4,
-            1352.0,
-            1384.8,
-            1359.1,
-            1419.7,
-            1404.2,
-            1352.0,
-            1397.1,
-            1369.5,
-            1397.1
+        6: [
+            2660.1,
+            2378.9,
+            2526.9,
+            1969.0,
+            1700.1,
+            1386.2,
+            1222.9,
+            1073.8,
+            1273.7,
+            1678.5,
+            2061.5,
+            2403.1
         ],
-        4: [
-            1481.9,
-            1333.7,
-            1481.9,
-            1424.0,
-            1459.5,
-            1427.1,
-            1498.0,
-            1473.8,
-            1424.0,
-            1470.7,
-            1443.2,
-            1470.7
+        7: [
+            2417.2,
+            2138.7,
+            2248.7,
+            1747.0,
+            1538.1,
+            1303.8,
+            1093.0,
+            1018.4,
+            1108.0,
+            1529.1,
+            1930.1,
+            2196.1
+        ],
+        8: [
+            1668.1,
+            1522.5,
+            1648.1,
+            1400.8,
+            1258.8,
+            1159.7,
+            1076.6,
+            1031.0,
+            1041.1,
+            1189.9,
+            1395.2,
+            1550.2
         ]
-    }
-
-    # 表6 調理の参照一次エネルギー消費量
-    ref_CC = {
+    },
+    4: {
         1: [
-            191,
-            171.1,
-            191,
-            179.5,
-            180.6,
-            183.6,
-            193.1,
-            189.9,
-            179.5,
-            185.8,
-            185.8,
-            185.8
+            3377.2,
+            3021.8,
+            3267.5,
+            2710.3,
+            2456.3,
+            2163.7,
+            2097.3,
+            1854.1,
+            2056.9,
+            2496.7,
+            2803.2,
+            3187.1
         ],
         2: [
-            235.3,
-            211.3,
-            235.3,
-            220.1,
-            221.2,
-            227.6,
-            234.3,
-            235.7,
-            220.1,
-            228.2,
-            226.6,
-            228.2
+            3319.7,
+            2983.9,
+            3249.4,
+            2653.7,
+            2415.6,
+            2173.8,
+            2018.7,
+            1801.5,
+            1954.3,
+            2395.7,
+            2736.7,
+            3084.8
         ],
         3: [
-            284,
-            255.1,
-            284,
-            265.7,
-            267,
-            274.7,
-            282.8,
-            284.6,
-            265.7,
-            275.5,
-            273.6,
-            275.5
+            3084.6,
+            2776.0,
+            2912.6,
+            2486.9,
+            2224.0,
+            1996.0,
+            1926.5,
+            1727.2,
+            1841.0,
+            2278.5,
+            2580.8,
+            2857.6
         ],
         4: [
-            332.7,
-            298.8,
-            332.7,
-            311.2,
-            312.8,
-            321.9,
-            331.4,
-            333.4,
-            311.2,
-            322.8,
-            320.5,
-            322.8
+            2997.5,
+            2734.1,
+            2896.0,
+            2412.8,
+            2125.0,
+            1904.1,
+            1853.3,
+            1626.4,
+            1791.4,
+            2190.0,
+            2520.8,
+            2784.2
+        ],
+        5: [
+            3211.2,
+            2910.5,
+            3031.3,
+            2425.0,
+            2037.1,
+            1825.2,
+            1671.2,
+            1473.9,
+            1589.9,
+            2122.0,
+            2533.8,
+            3033.1
+        ],
+        6: [
+            2994.4,
+            2679.2,
+            2841.1,
+            2217.1,
+            1916.9,
+            1561.0,
+            1376.9,
+            1215.4,
+            1434.7,
+            1891.2,
+            2317.5,
+            2708.8
+        ],
+        7: [
+            2720.5,
+            2408.5,
+            2528.0,
+            1967.8,
+            1734.9,
+            1469.3,
+            1231.4,
+            1153.1,
+            1250.3,
+            1723.0,
+            2169.6,
+            2475.9
+        ],
+        8: [
+            1877.3,
+            1714.4,
+            1852.7,
+            1577.1,
+            1421.2,
+            1309.9,
+            1213.4,
+            1167.3,
+            1177.8,
+            1343.4,
+            1568.2,
+            1747.1
         ]
     }
 
-    # 換気
-    E_V_ref = np.array([get_E_V_ref_m(alpha_V_M, A_A, beta_V_M, C_V) for (
-        alpha_V_M, beta_V_M) in zip(coeff_alpha_V_m, coeff_beta_V_m[p])])
+}
+
+# 表5 家電の参照一次エネルギー消費量
+ref_AP = {
+    1: [
+        849.7,
+        765.3,
+        849.7,
+        815.6,
+        836.1,
+        819.9,
+        854.6,
+        847.2,
+        815.6,
+        842.9,
+        824.9,
+        842.9
+    ],
+    2: [
+        1031.2,
+        928.7,
+        1031.2,
+        988.7,
+        1012.5,
+        995.1,
+        1037.2,
+        1028.3,
+        988.7,
+        1021.9,
+        1001.0,
+        1021.9
+    ],
+    3: [
+        1409.4,
+        1268.9,
+        1409.4,
+        1352.0,
+        1384.8,
+        1359.1,
+        1419.7,
+        1404.2,
+        1352.0,
+        1397.1,
+        1369.5,
+        1397.1
+    ],
+    4: [
+        1481.9,
+        1333.7,
+        1481.9,
+        1424.0,
+        1459.5,
+        1427.1,
+        1498.0,
+        1473.8,
+        1424.0,
+        1470.7,
+        1443.2,
+        1470.7
+    ]
+}
+
+# 表6 調理の参照一次エネルギー消費量
+ref_CC = {
+    1: [
+        191,
+        171.1,
+        191,
+        179.5,
+        180.6,
+        183.6,
+        193.1,
+        189.9,
+        179.5,
+        185.8,
+        185.8,
+        185.8
+    ],
+    2: [
+        235.3,
+        211.3,
+        235.3,
+        220.1,
+        221.2,
+        227.6,
+        234.3,
+        235.7,
+        220.1,
+        228.2,
+        226.6,
+        228.2
+    ],
+    3: [
+        284,
+        255.1,
+        284,
+        265.7,
+        267,
+        274.7,
+        282.8,
+        284.6,
+        265.7,
+        275.5,
+        273.6,
+        275.5
+    ],
+    4: [
+        332.7,
+        298.8,
+        332.7,
+        311.2,
+        312.8,
+        321.9,
+        331.4,
+        333.4,
+        311.2,
+        322.8,
+        320.5,
+        322.8
+    ]
+}
+
+
+def _get_coeff_table(coeff) -> np.ndarray:
+    """係数表を世帯の人数・地域の区分・月で引ける配列にする
+
+    Args:
+        coeff (list or dict): 月別の係数 (list), 世帯の人数別の係数 (dict) 又は
+                              世帯の人数・地域の区分別の係数 (dictのdict)
+
+    Returns:
+        np.ndarray: 係数表 [世帯の人数 - 1, 地域の区分 - 1, 月], (4, 8, 12)
+    """
+    table = np.zeros((4, 8, 12))
+    for p in range(1, 5):
+        for region in range(1, 9):
+            if isinstance(coeff, list):
+                table[p - 1, region - 1] = coeff
+            elif isinstance(coeff[p], list):
+                table[p - 1, region - 1] = coeff[p]
+            else:
+                table[p - 1, region - 1] = coeff[p][region]
+    return table
+
 
-    # 給湯
-    E_L_ref = np.array([get_E_L_ref_m(A_A, alpha_L_M, A_MR, beta_L_M, A_OR, gamma_L_M, delta_L_M, C_L) for (alpha_L_M, beta_L_M, gamma_L_M, delta_L_M) in zip(
-        coeff_alpha_L_m[p], coeff_beta_L_m[p], coeff_gamma_L_m[p], coeff_delta_L_m[p])])
+# 参照一次エネルギー消費量の係数表 [世帯の人数 - 1, 地域の区分 - 1, 係数, 月]
+# 係数は α_V, β_V, α_L, β_L, γ_L, δ_L, 給湯, 家電, 調理 の順
+coeff_E_ref = np.stack([_get_coeff_table(coeff) for coeff in (
+    coeff_alpha_V_m, coeff_beta_V_m,
+    coeff_alpha_L_m, coeff_beta_L_m, coeff_gamma_L_m, coeff_delta_L_m,
+    ref_HW, ref_AP, ref_CC)], axis=2)
 
-    # 照明
-    E_HW_ref = np.array([calc_E_HW_ref_m(ref_HW, C_HW)
-                        for ref_HW in ref_HW[p][region]])
+
+def get_index_E_ref(p, region) -> tuple:
+    """参照一次エネルギー消費量の係数表の添字
+
+    Args:
+        p (int or np.ndarray): 世帯の人数
+        region (int or np.ndarray): 地域の区分
+
+    Returns:
+        tuple: 世帯の人数 - 1, 地域の区分 - 1
+    """
+    p = np.asarray(p)
+    region = np.asarray(region)
+
+    if np.any((p < 1) | (p > 4)):
+        raise ValueError(p[(p < 1) | (p > 4)].flat[0] if p.ndim else p)
+    if np.any((region < 1) | (region > 8)):
+        raise ValueError(region[(region < 1) | (region > 8)].flat[0] if region.ndim else region)
+
+    return p - 1, region - 1
+
+
+def get_coeff_E_ref(p, region) -> np.ndarray:
+    """参照一次エネルギー消費量の係数
+
+    Args:
+        p (int or np.ndarray): 世帯の人数
+        region (int or np.ndarray): 地域の区分
+
+    Returns:
+        np.ndarray: α_V, β_V, α_L, β_L, γ_L, δ_L, 給湯, 家電, 調理の月別の係数, (..., 9, 12)
+    """
+    return coeff_E_ref[get_index_E_ref(p, region)]
+
+
+def _get_basis_E_ref() -> np.ndarray:
+    """調整係数を 1 とした参照一次エネルギー消費量の基底
+
+    式(69)(70)(72)と家電・調理の参照一次エネルギー消費量は床面積 A_A, A_MR, A_OR, A_N_R と
+    定数項の一次式なので、その係数を世帯の人数・地域の区分ごとに並べる。
+
+    Returns:
+        np.ndarray: 基底 [世帯の人数 - 1, 地域の区分 - 1, 変数, 設備, 月], (4, 8, 5, 5, 12)
+                    変数は A_A, A_MR, A_OR, A_N_R, 1 の順、設備は換気, 照明, 給湯, 家電, 調理の順
+    """
+    alpha_V, beta_V, alpha_L, beta_L, gamma_L, delta_L, ref_HW_m, ref_AP_m, ref_CC_m \
+        = np.moveaxis(coeff_E_ref, 2, 0)
+
+    basis = np.zeros((4, 8, 5, 5, 12))
+
+    # 換気 式(69)
+    basis[:, :, 0, 0] = alpha_V
+    basis[:, :, 4, 0] = beta_V
+
+    # 照明 式(70)
+    basis[:, :, 1, 1] = alpha_L
+    basis[:, :, 2, 1] = beta_L
+    basis[:, :, 3, 1] = gamma_L
+    basis[:, :, 4, 1] = delta_L
+
+    # 給湯 式(72)
+    basis[:, :, 4, 2] = ref_HW_m
 
     # 家電
-    E_AP_ref = np.array([calc_E_AP_ref_m(ref_AP, C_AP)
-                        for ref_AP in ref_AP[p]])
+    basis[:, :, 4, 3] = ref_AP_m
 
     # 調理
-    E_CC_ref = np.array([calc_E_CC_ref_m(ref_CC, C_CC)
-                        for ref_CC in ref_CC[p]])
+    basis[:, :, 4, 4] = ref_CC_m
+
+    return basis
 
-    E_exHC_ref = np.array([get_E_exHC_ref_m(E_V_ref_m, E_L_ref_m, E_HW_ref_m, E_AP_ref_m, E_CC_ref_m) for (
-        E_V_ref_m, E_L_ref_m, E_HW_ref_m, E_AP_ref_m, E_CC_ref_m) in zip(E_V_ref, E_L_ref, E_HW_ref, E_AP_ref, E_CC_ref)])
+
+# 参照一次エネルギー消費量の基底 [世帯の人数 - 1, 地域の区分 - 1, 変数, 設備, 月]
+basis_E_ref = _get_basis_E_ref()
+
+
+def get_x_E_ref(A_MR, A_OR, A_A) -> np.ndarray:
+    """参照一次エネルギー消費量の基底に掛ける変数
+
+    Args:
+        A_MR (np.ndarray): 主たる居室の床面積, (N,)
+        A_OR (np.ndarray): その他の居室の床面積, (N,)
+        A_A (np.ndarray): 床面積の合計, (N,)
+
+    Returns:
+        np.ndarray: A_A, A_MR, A_OR, A_N_R, 1, (N, 5)
+    """
+    A_N_R = get_A_N_R(A_A, A_MR, A_OR)
+    return np.stack([A_A, A_MR, A_OR, A_N_R, np.ones(len(A_A))], axis=1)
+
+
+def get_E_ref(p, region, A_MR, A_OR, A_A,
+              C_V, C_L, C_HW, C_AP, C_CC):
+    """各設備の参照一次エネルギー消費量
+
+    Args:
+        p (int): 世帯の人数,
+        region (int): 地域の区分
+        A_MR (float): 主たる居室の床面積
+        A_OR (bool): その他の居室の床面積
+        A_A (bool): 床面積の合計
+        C_V (bool): 換気設備の調整係数
+        C_L (bool): 照明設備の調整係数
+        C_HW (bool): 給湯設備の調整係数
+        C_AP (bool): 家電設備の調整係数
+        C_CC (bool): 調理設備の調整係数
+
+    Returns:
+        tuple: 各設備の参照一次エネルギー消費量
+
+    """
+    E_ref_unit = get_E_ref_unit(p, region, A_MR, A_OR, A_A)
+
+    return get_E_ref_from_unit(E_ref_unit, C_V, C_L, C_HW, C_AP, C_CC)
+
+
+def get_E_ref_batch(p, region, A_MR, A_OR, A_A,
+                    C_V, C_L, C_HW, C_AP, C_CC):
+    """各設備の参照一次エネルギー消費量 (複数世帯の一括計算)
+
+    Args:
+        p (np.ndarray): 世帯の人数, (N,)
+        region (np.ndarray): 地域の区分, (N,)
+        A_MR (np.ndarray): 主たる居室の床面積, (N,)
+        A_OR (np.ndarray): その他の居室の床面積, (N,)
+        A_A (np.ndarray): 床面積の合計, (N,)
+        C_V (np.ndarray): 換気設備の調整係数, (N,)
+        C_L (np.ndarray): 照明設備の調整係数, (N,)
+        C_HW (np.ndarray): 給湯設備の調整係数, (N,)
+        C_AP (np.ndarray): 家電設備の調整係数, (N,)
+        C_CC (np.ndarray): 調理設備の調整係数, (N,)
+
+    Returns:
+        tuple: 各設備の参照一次エネルギー消費量, 各 (N, 12)
+
+    """
+    E_ref_unit = get_E_ref_unit_batch(p, region, A_MR, A_OR, A_A)
+
+    return get_E_ref_from_unit(E_ref_unit, C_V, C_L, C_HW, C_AP, C_CC)
+
+
+def get_E_ref_unit(p, region, A_MR, A_OR, A_A) -> np.ndarray:
+    """調整係数を 1 とした各設備の参照一次エネルギー消費量
+
+    Args:
+        p (int): 世帯の人数,
+        region (int): 地域の区分
+        A_MR (float): 主たる居室の床面積
+        A_OR (float): その他の居室の床面積
+        A_A (float): 床面積の合計
+
+    Returns:
+        np.ndarray: 換気, 照明, 給湯, 家電, 調理の月別の参照一次エネルギー消費量, (5, 12)
+
+    """
+    return get_E_ref_unit_batch(np.array([p]), np.array([region]),
+                                np.array([A_MR], dtype=float), np.array([A_OR], dtype=float),
+                                np.array([A_A], dtype=float))[0]
+
+
+def get_E_ref_unit_batch(p, region, A_MR, A_OR, A_A) -> np.ndarray:
+    """調整係数を 1 とした各設備の参照一次エネルギー消費量 (複数世帯の一括計算)
+
+    燃料によらず共通なので世帯ごとに一度だけ求め、get_E_ref_from_unit で燃料ごとの調整係数を掛ける。
+    世帯の人数・地域の区分ごとに、床面積の変数と基底 basis_E_ref との縮約で求める。
+    縮約は BLAS を使わない np.einsum で行い、変数の順に加算して get_E_V_ref_m, get_E_L_ref_m と
+    同じ丸め誤差にする。
+
+    Args:
+        p (np.ndarray): 世帯の人数, (N,)
+        region (np.ndarray): 地域の区分, (N,)
+        A_MR (np.ndarray): 主たる居室の床面積, (N,)
+        A_OR (np.ndarray): その他の居室の床面積, (N,)
+        A_A (np.ndarray): 床面積の合計, (N,)
+
+    Returns:
+        np.ndarray: 換気, 照明, 給湯, 家電, 調理の月別の参照一次エネルギー消費量, (N, 5, 12)
+
+    """
+    x = get_x_E_ref(A_MR, A_OR, A_A)
+
+    # 世帯の人数・地域の区分ごとに並べ替えて縮約する
+    i_p, i_region = get_index_E_ref(p, region)
+    group = i_p * 8 + i_region
+    order = np.argsort(group, kind='stable')
+    bounds = np.flatnonzero(np.diff(group[order])) + 1
+
+    E_ref_unit = np.empty((len(p), 5, 12))
+    for rows in np.split(order, bounds):
+        if len(rows) == 0:
+            continue
+        p_g, region_g = divmod(group[rows[0]], 8)
+        E_ref_unit[rows] = np.einsum('nk,kum->num', x[rows], basis_E_ref[p_g, region_g])
+
+    return E_ref_unit
+
+
+def get_E_ref_from_unit(E_ref_unit, C_V, C_L, C_HW, C_AP, C_CC):
+    """調整係数を 1 とした参照一次エネルギー消費量に調整係数を掛ける
+
+    Args:
+        E_ref_unit (np.ndarray): 調整係数を 1 とした各設備の参照一次エネルギー消費量, (..., 5, 12)
+        C_V (float or np.ndarray): 換気設備の調整係数
+        C_L (float or np.ndarray): 照明設備の調整係数
+        C_HW (float or np.ndarray): 給湯設備の調整係数
+        C_AP (float or np.ndarray): 家電設備の調整係数
+        C_CC (float or np.ndarray): 調理設備の調整係数
+
+    Returns:
+        tuple: 各設備の参照一次エネルギー消費量, 各 (..., 12)
+
+    """
+    C = np.stack(np.broadcast_arrays(C_V, C_L, C_HW, C_AP, C_CC), axis=-1)
+
+    E_V_ref, E_L_ref, E_HW_ref, E_AP_ref, E_CC_ref = np.moveaxis(E_ref_unit * C[..., None], -2, 0)
+    E_exHC_ref = get_E_exHC_ref_m(E_V_ref, E_L_ref, E_HW_ref, E_AP_ref, E_CC_ref)
 
     return E_V_ref, E_L_ref, E_HW_ref, E_AP_ref, E_CC_ref, E_exHC_ref
+
+
+def get_S_exHC_batch(
+    E_exHC_ref: np.ndarray,
+    IM: np.ndarray,
+    S: np.ndarray,
+) -> np.ndarray:
+    """暖冷房設備以外の用途の消費量 (複数世帯の一括計算) 式(65b)
+
+    get_S_exHC を中間月のマスクによる集計で書き直したもの。
+
+    Args:
+        E_exHC_ref (np.ndarray): 月別の暖冷房設備以外の用途の参照一次エネルギー消費量, (N, 12)
+        IM (np.ndarray): 各月が中間月か否か, (N, 12)
+        S (np.ndarray): 月別消費量, (N, 12)
+
+    Returns:
+        np.ndarray: 月別の暖冷房設備以外の用途の消費量, (N, 12)
+    """
+    r_S_exHC_ref = get_r_S_exHC_ref_batch(E_exHC_ref)
+
+    # 中間期月の割合とエネルギーを合計する
+    sum_cons = _sum_m(np.where(IM, S, 0.0))
+    sum_ratio = _sum_m(np.where(IM, r_S_exHC_ref, 0.0))
+
+    # 中間期月がない場合、cons の最小値を採用し、その月のratioを採用する
+    # (builtin の min と同じく、先頭の月が NaN ならば NaN、それ以外の NaN は無視する)
+    min_cons = np.where(np.isnan(S[:, 0]), S[:, 0], np.fmin.reduce(S, axis=1, initial=np.inf))
+    min_ratio = np.take_along_axis(r_S_exHC_ref, np.argmin(S, axis=1)[:, None], axis=1)[:, 0]
+
+    has_IM = IM.any(axis=1)
+    sum_cons = np.where(has_IM, sum_cons, min_cons)
+    sum_ratio = np.where(has_IM, sum_ratio, min_ratio)
+
+    S_exHC = np.divide(sum_cons, sum_ratio, out=np.zeros(len(S)), where=sum_ratio != 0.0)
+
+    # 中間月以外は min(S_m, S_exHC * r_s_exHC_ref_m)
+    S_exHC_ref = S_exHC[:, None] * r_S_exHC_ref
+    return np.where(IM | ~(S_exHC_ref < S), S, S_exHC_ref)
+
+
+def get_r_S_exHC_ref_batch(
+    E_exHC_ref: np.ndarray,
+) -> np.ndarray:
+    """月mにおける暖冷房設備以外の用途の参照一次エネルギー消費量が暖冷房設備以外の
+       用途の参照一次エネルギー消費量の年間合計値に占める割合 (複数世帯の一括計算) 式(67)
+
+    Args:
+        E_exHC_ref (np.ndarray): 月別の暖冷房設備以外の用途の参照一次エネルギー消費量, (N, 12)
+
+    Returns:
+        np.ndarray: 月別の暖冷房設備以外の用途の参照一次エネルギー消費量の年間合計値に占める割合, (N, 12)
+    """
+    total = _sum_m(E_exHC_ref)
+
+    return np.divide(E_exHC_ref, total[:, None], out=np.zeros(E_exHC_ref.shape), where=total[:, None] != 0)
+
+
+def _sum_m(X: np.ndarray) -> np.ndarray:
+    """月別の値を 1月から順に合計する
+
+    np.sum は 8 個以上の要素をまとめて加算するため、builtin の sum と丸め誤差が変わる。
+    累積和は常に先頭から順に加算するので、その最後の値を使う。
+
+    Args:
+        X (np.ndarray): 月別の値, (N, 12)
+
+    Returns:
+        np.ndarray: 年間合計値, (N,)
+    """
+    return np.cumsum(X, axis=1)[:, -1]
@@ -1,5 +1,11 @@
 """5.月別のガスの一次エネルギー消費量"""
 
+import numpy as np
+
+
+# ガスの種類ごとの一次エネルギー換算係数の規定値, MJ/m³
+f_PE_G_by_gas_type = {'都市ガス': 45.0, 'ＬＰガス': 100.0}
+
 def get_E_p_G_H_m(
     S_m: float,
     S_exHC_m: float,
@@ -155,25 +161,59 @@ def get_f_PE_G(
     gas_type: str,
     f_PE_G: float
 ) -> float:
-    """月mにおけるガスの調理の一次エネルギー消費量
+    """計算に用いるガスの一次エネルギー換算係数, MJ/m³
 
-  Args:
-        S_CC_m (float): 月mにおける調理の用途の消費量, m³
-        f_PE_G (float): ガスの一次エネルギー換算係数, MJ/m³
+    Args:
+        use_specified_f_PE_G (str): ガスの一次エネルギー換算係数の規定値の使用 ('使用する' or '使用しない')
+        gas_type (str): ガスの種類 ('都市ガス' or 'ＬＰガス')
+        f_PE_G (float): 指定されたガスの一次エネルギー換算係数, MJ/m³
 
     Returns:
-        float: 月mにおけるガスの調理の一次エネルギー消費量, MJ
+        float: ガスの一次エネルギー換算係数, MJ/m³
     """
     if use_specified_f_PE_G == '使用する':
-        if gas_type == '都市ガス':
-            return 45.0
-        elif gas_type == 'ＬＰガス':
-            return 100.0
+        if gas_type in f_PE_G_by_gas_type:
+            return f_PE_G_by_gas_type[gas_type]
         raise ValueError(gas_type)
     else:
         return f_PE_G
 
 
+def get_f_PE_G_batch(
+    use_specified_f_PE_G: np.ndarray,
+    gas_type: np.ndarray,
+    f_PE_G: np.ndarray
+) -> np.ndarray:
+    """計算に用いるガスの一次エネルギー換算係数 (複数世帯の一括計算)
+
+    規定値はガスの種類ごとに一度だけ引き、同じ種類の世帯に割り当てる。
+    規定値の使用が '使用する', '使用しない' 以外の場合や、'使用しない' で換算係数が空欄の場合は ValueError とする。
+
+    Args:
+        use_specified_f_PE_G (np.ndarray): ガスの一次エネルギー換算係数の規定値の使用 ('使用する' or '使用しない'), (N,)
+        gas_type (np.ndarray): ガスの種類, (N,)
+        f_PE_G (np.ndarray): 指定されたガスの一次エネルギー換算係数, MJ/m³, (N,)
+
+    Returns:
+        np.ndarray: ガスの一次エネルギー換算係数, MJ/m³, (N,)
+    """
+    use_specified_f_PE_G = np.asarray(use_specified_f_PE_G, dtype=object)
+    use_specified = use_specified_f_PE_G == '使用する'
+    valid = use_specified | (use_specified_f_PE_G == '使用しない')
+    if not np.all(valid):
+        raise ValueError(use_specified_f_PE_G[~valid][0])
+
+    f_PE_G = np.array(f_PE_G, dtype=float)
+    missing = ~use_specified & np.isnan(f_PE_G)
+    if np.any(missing):
+        raise ValueError(f_PE_G[missing][0])
+
+    gas_types, codes = np.unique(np.asarray(gas_type, dtype=object)[use_specified].astype(str), return_inverse=True)
+    f_PE_G[use_specified] = np.array([get_f_PE_G('使用する', t, np.nan) for t in gas_types], dtype=float)[codes]
+
+    return f_PE_G
+
+
 def get_U_H_m(
     U_G_H_m: bool
 ) -> bool:
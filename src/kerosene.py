@@ -1,5 +1,7 @@
 """5.月別の灯油の一次エネルギー消費量"""
 
+import numpy as np
+
 def get_E_p_K_H_m(
     S_m: float,
     S_exHC_m: float,
@@ -164,6 +166,35 @@ def get_f_PE_K(
         raise ValueError(use_specified_f_PE_K)
 
 
+def get_f_PE_K_batch(
+    use_specified_f_PE_K: np.ndarray,
+    f_PE_K: np.ndarray
+) -> np.ndarray:
+    """計算に用いる灯油の一次エネルギー換算係数 (複数世帯の一括計算)
+
+    規定値の使用が '使用する', '使用しない' 以外の場合や、'使用しない' で換算係数が空欄の場合は ValueError とする。
+
+    Args:
+        use_specified_f_PE_K (np.ndarray): 灯油の一次エネルギー換算係数の規定値の使用 ('使用する' or '使用しない'), (N,)
+        f_PE_K (np.ndarray): 指定された灯油の一次エネルギー換算係数, MJ/L, (N,)
+
+    Returns:
+        np.ndarray: 灯油の一次エネルギー換算係数, MJ/L, (N,)
+    """
+    use_specified_f_PE_K = np.asarray(use_specified_f_PE_K, dtype=object)
+    use_specified = use_specified_f_PE_K == '使用する'
+    valid = use_specified | (use_specified_f_PE_K == '使用しない')
+    if not np.all(valid):
+        raise ValueError(use_specified_f_PE_K[~valid][0])
+
+    f_PE_K = np.asarray(f_PE_K, dtype=float)
+    missing = ~use_specified & np.isnan(f_PE_K)
+    if np.any(missing):
+        raise ValueError(f_PE_K[missing][0])
+
+    return np.where(use_specified, get_f_PE_K('使用する', np.nan), f_PE_K)
+
+
 def get_U_H_m(
     U_K_H_m: bool
 ) -> bool:
@@ -256,7 +256,7 @@ def get_E_p_CC_m(
 
 def get_E_p_E(p, region, A_MR, A_OR, A_A, ele_cos,
               ele_htg_use, ele_clg_use, vnt_use, vnt_coeff, hws_use, hws_coeff,
-              ltg_use, ltg_coeff, eap_use, eap_coeff, ckg_use, ckg_coeff, f_PE_E):
+              ltg_use, ltg_coeff, eap_use, eap_coeff, ckg_use, ckg_coeff, f_PE_E, E_ref_unit=None):
     """月別の電気の一次エネルギー消費量
 
     Args:
@@ -279,6 +279,7 @@ def get_E_p_E(p, region, A_MR, A_OR, A_A, ele_cos,
         ckg_use (bool): 電気を調理に使用しているかの有無
         ckg_coeff (float): 電気を調理に使用している場合の調整係数
         f_PE_E (float): 電気の一次エネルギー換算係数, MJ/m³
+        E_ref_unit (np.ndarray, optional): 調整係数を 1 とした各設備の参照一次エネルギー消費量, (5, 12)
 
     Returns:
         tuple: 月別の電気の一次エネルギー消費量
@@ -294,9 +295,11 @@ def get_E_p_E(p, region, A_MR, A_OR, A_A, ele_cos,
     C_AP = ele.get_C_AP(eap_use, eap_coeff)
     C_CC = ele.get_C_CC(ckg_use, ckg_coeff)
 
+    # 各設備の参照一次エネルギー消費量
+    if E_ref_unit is None:
+        E_ref_unit = energy.get_E_ref_unit(p, region, A_MR, A_OR, A_A)
     E_V_ref, E_L_ref, E_HW_ref, E_AP_ref, E_CC_ref, E_exHC_ref \
-        = energy.get_E_ref(p, region, A_MR, A_OR, A_A,
-                      C_V, C_L, C_HW, C_AP, C_CC)
+        = energy.get_E_ref_from_unit(E_ref_unit, C_V, C_L, C_HW, C_AP, C_CC)
 
     # 月別消費量
     S = np.array([ele.get_S_m(S_E_m) for (S_E_m) in ele_cos])
@@ -347,7 +350,7 @@ def get_E_p_E(p, region, A_MR, A_OR, A_A, ele_cos,
 
 def get_E_p_G(p, region, A_MR, A_OR, A_A, gas_cos,
               gas_htg_use, gas_clg_use, hws_use, hws_coeff,
-              ckg_use, ckg_coeff, f_PE_G):
+              ckg_use, ckg_coeff, f_PE_G, E_ref_unit=None):
     """月別のガスの一次エネルギー消費量
 
     Args:
@@ -364,6 +367,7 @@ def get_E_p_G(p, region, A_MR, A_OR, A_A, gas_cos,
         ckg_use (bool): ガスを調理に使用しているかの有無
         ckg_coeff (float): ガスを調理に使用している場合の調整係数
         f_PE_G (float): ガスの一次エネルギー換算係数, MJ/m³
+        E_ref_unit (np.ndarray, optional): 調整係数を 1 とした各設備の参照一次エネルギー消費量, (5, 12)
 
     Returns:
         tuple: 月別のガスの一次エネルギー消費量
@@ -379,9 +383,11 @@ def get_E_p_G(p, region, A_MR, A_OR, A_A, gas_cos,
     C_AP = gas.get_C_AP()
     C_CC = gas.get_C_CC(ckg_use, ckg_coeff)
 
+    # 各設備の参照一次エネルギー消費量
+    if E_ref_unit is None:
+        E_ref_unit = energy.get_E_ref_unit(p, region, A_MR, A_OR, A_A)
     E_V_ref, E_L_ref, E_HW_ref, E_AP_ref, E_CC_ref, E_exHC_ref \
-        = energy.get_E_ref(p, region, A_MR, A_OR, A_A,
-                      C_V, C_L, C_HW, C_AP, C_CC)
+        = energy.get_E_ref_from_unit(E_ref_unit, C_V, C_L, C_HW, C_AP, C_CC)
 
     # 月別消費量
     S = np.array([gas.get_S_m(S_E_m) for (S_E_m) in gas_cos])
@@ -431,7 +437,7 @@ def get_E_p_G(p, region, A_MR, A_OR, A_A, gas_cos,
 
 
 def get_E_p_K(p, region, A_MR, A_OR, A_A, k_cos,
-              k_htg_use, k_clg_use, hws_use, hws_coeff, f_PE_K):
+              k_htg_use, k_clg_use, hws_use, hws_coeff, f_PE_K, E_ref_unit=None):
     """月別の灯油の一次エネルギー消費量
 
     Args:
@@ -446,6 +452,7 @@ def get_E_p_K(p, region, A_MR, A_OR, A_A, k_cos,
         hws_use (bool): 灯油を給湯設備に使用しているかの有無
         hws_coeff (float): 灯油を給湯設備に使用している場合の調整係数
         f_PE_K (float): 灯油の一次エネルギー換算係数, MJ/m³
+        E_ref_unit (np.ndarray, optional): 調整係数を 1 とした各設備の参照一次エネルギー消費量, (5, 12)
 
     Returns:
         tuple: 月別の灯油の一次エネルギー消費量
@@ -461,9 +468,11 @@ def get_E_p_K(p, region, A_MR, A_OR, A_A, k_cos,
     C_AP = k.get_C_AP()
     C_CC = k.get_C_CC()
 
+    # 各設備の参照一次エネルギー消費量
+    if E_ref_unit is None:
+        E_ref_unit = energy.get_E_ref_unit(p, region, A_MR, A_OR, A_A)
     E_V_ref, E_L_ref, E_HW_ref, E_AP_ref, E_CC_ref, E_exHC_ref \
-        = energy.get_E_ref(p, region, A_MR, A_OR, A_A,
-                      C_V, C_L, C_HW, C_AP, C_CC)
+        = energy.get_E_ref_from_unit(E_ref_unit, C_V, C_L, C_HW, C_AP, C_CC)
 
     # 月別消費量
     S = np.array([k.get_S_m(S_K_m) for (S_K_m) in k_cos])
@@ -543,3 +552,234 @@ def get_IM_m(
 
     """
     return U_H_m == False and U_C_m == False
+
+
+def get_E_p_E_batch(p, region, A_MR, A_OR, A_A, ele_cos,
+                    ele_htg_use, ele_clg_use, vnt_use, vnt_coeff, hws_use, hws_coeff,
+                    ltg_use, ltg_coeff, eap_use, eap_coeff, ckg_use, ckg_coeff, f_PE_E, E_ref_unit=None, uses=None):
+    """月別の電気の一次エネルギー消費量 (複数世帯の一括計算)
+
+    Args:
+        p (np.ndarray): 世帯の人数, (N,)
+        region (np.ndarray): 地域の区分, (N,)
+        A_MR (np.ndarray): 主たる居室の床面積, (N,)
+        A_OR (np.ndarray): その他の居室の床面積, (N,)
+        A_A (np.ndarray): 床面積の合計, (N,)
+        ele_cos (np.ndarray): 電気の月別消費量, (N, 12)
+        ele_htg_use (np.ndarray): 暖房を使用しているかの有無, (N, 12)
+        ele_clg_use (np.ndarray): 冷房を使用しているかの有無, (N, 12)
+        vnt_use (np.ndarray): 電気を換気設備に使用しているかの有無, (N,)
+        vnt_coeff (np.ndarray): 電気を換気設備に使用している場合の調整係数, (N,)
+        hws_use (np.ndarray): 電気を給湯設備に使用しているかの有無, (N,)
+        hws_coeff (np.ndarray): 電気を給湯設備に使用している場合の調整係数, (N,)
+        ltg_use (np.ndarray): 電気を照明設備に使用しているかの有無, (N,)
+        ltg_coeff (np.ndarray): 電気を照明設備に使用している場合の調整係数, (N,)
+        eap_use (np.ndarray): 電気を家電設備に使用しているかの有無, (N,)
+        eap_coeff (np.ndarray): 電気を家電設備に使用している場合の調整係数, (N,)
+        ckg_use (np.ndarray): 電気を調理に使用しているかの有無, (N,)
+        ckg_coeff (np.ndarray): 電気を調理に使用している場合の調整係数, (N,)
+        f_PE_E (np.ndarray): 電気の一次エネルギー換算係数, MJ/kWh, (N,)
+        E_ref_unit (np.ndarray, optional): 調整係数を 1 とした各設備の参照一次エネルギー消費量, (N, 5, 12)
+        uses (list, optional): 求める用途の番号 (get_E_p_split_batch を参照). 省略時はすべて
+
+    Returns:
+        tuple: 月別の電気の一次エネルギー消費量, 各 (N, 12) (求めない用途は None)
+
+    """
+    # 各月が中間月か否かの値
+    IM = get_IM_batch(ele_htg_use, ele_clg_use)
+
+    # 各設備の調整係数 式(21)～(25)
+    C_V = np.where(vnt_use, vnt_coeff, 0.0)
+    C_L = np.where(ltg_use, ltg_coeff, 0.0)
+    C_HW = np.where(hws_use, hws_coeff, 0.0)
+    C_AP = np.where(eap_use, eap_coeff, 0.0)
+    C_CC = np.where(ckg_use, ckg_coeff, 0.0)
+
+    # 各設備の参照一次エネルギー消費量
+    if E_ref_unit is None:
+        E_ref_unit = energy.get_E_ref_unit_batch(p, region, A_MR, A_OR, A_A)
+    E_ref = energy.get_E_ref_from_unit(E_ref_unit, C_V, C_L, C_HW, C_AP, C_CC)
+
+    return _get_E_p_batch(E_ref, IM, ele_cos, ele_htg_use, ele_clg_use, f_PE_E, uses)
+
+
+def get_E_p_G_batch(p, region, A_MR, A_OR, A_A, gas_cos,
+                    gas_htg_use, gas_clg_use, hws_use, hws_coeff,
+                    ckg_use, ckg_coeff, f_PE_G, E_ref_unit=None, uses=None):
+    """月別のガスの一次エネルギー消費量 (複数世帯の一括計算)
+
+    Args:
+        p (np.ndarray): 世帯の人数, (N,)
+        region (np.ndarray): 地域の区分, (N,)
+        A_MR (np.ndarray): 主たる居室の床面積, (N,)
+        A_OR (np.ndarray): その他の居室の床面積, (N,)
+        A_A (np.ndarray): 床面積の合計, (N,)
+        gas_cos (np.ndarray): ガスの月別消費量, (N, 12)
+        gas_htg_use (np.ndarray): 暖房を使用しているかの有無, (N, 12)
+        gas_clg_use (np.ndarray): 冷房を使用しているかの有無, (N, 12)
+        hws_use (np.ndarray): ガスを給湯設備に使用しているかの有無, (N,)
+        hws_coeff (np.ndarray): ガスを給湯設備に使用している場合の調整係数, (N,)
+        ckg_use (np.ndarray): ガスを調理に使用しているかの有無, (N,)
+        ckg_coeff (np.ndarray): ガスを調理に使用している場合の調整係数, (N,)
+        f_PE_G (np.ndarray): ガスの一次エネルギー換算係数, MJ/m³, (N,)
+        E_ref_unit (np.ndarray, optional): 調整係数を 1 とした各設備の参照一次エネルギー消費量, (N, 5, 12)
+        uses (list, optional): 求める用途の番号 (get_E_p_split_batch を参照). 省略時はすべて
+
+    Returns:
+        tuple: 月別のガスの一次エネルギー消費量, 各 (N, 12) (求めない用途は None)
+
+    """
+    # 各月が中間月か否かの値
+    IM = get_IM_batch(gas_htg_use, gas_clg_use)
+
+    # 各設備の調整係数 式(36)～(40)
+    C_V = np.full(len(p), gas.get_C_V())
+    C_L = np.full(len(p), gas.get_C_L())
+    C_HW = np.where(hws_use, hws_coeff, 0.0)
+    C_AP = np.full(len(p), gas.get_C_AP())
+    C_CC = np.where(ckg_use, ckg_coeff, 0.0)
+
+    # 各設備の参照一次エネルギー消費量
+    if E_ref_unit is None:
+        E_ref_unit = energy.get_E_ref_unit_batch(p, region, A_MR, A_OR, A_A)
+    E_ref = energy.get_E_ref_from_unit(E_ref_unit, C_V, C_L, C_HW, C_AP, C_CC)
+
+    # ガスは冷房設備に使用しない 式(35)
+    U_C = np.full(gas_clg_use.shape, gas.get_U_C_m())
+
+    return _get_E_p_batch(E_ref, IM, gas_cos, gas_htg_use, U_C, f_PE_G, uses)
+
+
+def get_E_p_K_batch(p, region, A_MR, A_OR, A_A, k_cos,
+                    k_htg_use, k_clg_use, hws_use, hws_coeff, f_PE_K, E_ref_unit=None, uses=None):
+    """月別の灯油の一次エネルギー消費量 (複数世帯の一括計算)
+
+    Args:
+        p (np.ndarray): 世帯の人数, (N,)
+        region (np.ndarray): 地域の区分, (N,)
+        A_MR (np.ndarray): 主たる居室の床面積, (N,)
+        A_OR (np.ndarray): その他の居室の床面積, (N,)
+        A_A (np.ndarray): 床面積の合計, (N,)
+        k_cos (np.ndarray): 灯油の月別消費量, (N, 12)
+        k_htg_use (np.ndarray): 暖房を使用しているかの有無, (N, 12)
+        k_clg_use (np.ndarray): 冷房を使用しているかの有無, (N, 12)
+        hws_use (np.ndarray): 灯油を給湯設備に使用しているかの有無, (N,)
+        hws_coeff (np.ndarray): 灯油を給湯設備に使用している場合の調整係数, (N,)
+        f_PE_K (np.ndarray): 灯油の一次エネルギー換算係数, MJ/L, (N,)
+        E_ref_unit (np.ndarray, optional): 調整係数を 1 とした各設備の参照一次エネルギー消費量, (N, 5, 12)
+        uses (list, optional): 求める用途の番号 (get_E_p_split_batch を参照). 省略時はすべて
+
+    Returns:
+        tuple: 月別の灯油の一次エネルギー消費量, 各 (N, 12) (求めない用途は None)
+
+    """
+    # 各月が中間月か否かの値
+    IM = get_IM_batch(k_htg_use, k_clg_use)
+
+    # 各設備の調整係数
+    C_V = np.full(len(p), k.get_C_V())
+    C_L = np.full(len(p), k.get_C_L())
+    C_HW = np.where(hws_use, hws_coeff, 0.0)
+    C_AP = np.full(len(p), k.get_C_AP())
+    C_CC = np.full(len(p), k.get_C_CC())
+
+    # 各設備の参照一次エネルギー消費量
+    if E_ref_unit is None:
+        E_ref_unit = energy.get_E_ref_unit_batch(p, region, A_MR, A_OR, A_A)
+    E_ref = energy.get_E_ref_from_unit(E_ref_unit, C_V, C_L, C_HW, C_AP, C_CC)
+
+    # 灯油は冷房設備に使用しない
+    U_C = np.full(k_clg_use.shape, k.get_U_C_m())
+
+    return _get_E_p_batch(E_ref, IM, k_cos, k_htg_use, U_C, f_PE_K, uses)
+
+
+def _get_E_p_batch(E_ref, IM, cos, U_H, U_C, f_PE, uses=None):
+    """月別消費量を用途別の一次エネルギー消費量に按分する (複数世帯の一括計算)
+
+    Args:
+        E_ref (tuple): 各設備の参照一次エネルギー消費量, 各 (N, 12)
+        IM (np.ndarray): 各月が中間月か否か, (N, 12)
+        cos (np.ndarray): 月別消費量, (N, 12)
+        U_H (np.ndarray): 暖房設備を使用しているかの有無, (N, 12)
+        U_C (np.ndarray): 冷房設備を使用しているかの有無, (N, 12)
+        f_PE (np.ndarray): 一次エネルギー換算係数, (N,)
+        uses (list, optional): 求める用途の番号 (get_E_p_split_batch を参照). 省略時はすべて
+
+    Returns:
+        tuple: 月別の暖房・冷房・換気・照明・給湯・家電・調理の一次エネルギー消費量, 各 (N, 12) (求めない用途は None)
+
+    """
+    # 月別消費量
+    S = cos
+
+    # 暖冷房設備以外の用途の消費量
+    S_exHC = energy.get_S_exHC_batch(E_ref[5], IM, S)
+
+    return get_E_p_split_batch(E_ref, S, S_exHC, U_H, U_C, f_PE, uses)
+
+
+def get_E_p_split_batch(E_ref, S, S_exHC, U_H, U_C, f_PE, uses=None):
+    """用途別の一次エネルギー消費量 (複数世帯の一括計算)
+
+    換気・照明・給湯・家電・調理のうち求める用途の割合を (N, 12, K) の配列としてまとめて求め、
+    暖冷房設備以外の用途の消費量に一度に掛ける。
+
+    Args:
+        E_ref (tuple): 各設備の参照一次エネルギー消費量, 各 (N, 12)
+        S (np.ndarray): 月別消費量, (N, 12)
+        S_exHC (np.ndarray): 暖冷房設備以外の用途の消費量, (N, 12)
+        U_H (np.ndarray): 暖房設備を使用しているかの有無, (N, 12)
+        U_C (np.ndarray): 冷房設備を使用しているかの有無, (N, 12)
+        f_PE (np.ndarray): 一次エネルギー換算係数, (N,)
+        uses (list, optional): 求める用途の番号 (0: 暖房, 1: 冷房, 2: 換気, 3: 照明, 4: 給湯, 5: 家電, 6: 調理). 省略時はすべて
+
+    Returns:
+        tuple: 月別の暖房・冷房・換気・照明・給湯・家電・調理の一次エネルギー消費量, 各 (N, 12) (求めない用途は None)
+
+    """
+    if uses is None:
+        uses = range(7)
+
+    E_p = [None] * 7
+    f_PE = f_PE[:, None]
+
+    # 暖房設備・冷房設備の一次エネルギー消費量 式(57)(58)
+    if 0 in uses or 1 in uses:
+        S_HC = S - S_exHC
+        if 0 in uses:
+            E_p[0] = np.where(U_H, S_HC, 0.0) * f_PE
+        if 1 in uses:
+            E_p[1] = np.where(U_C, S_HC, 0.0) * f_PE
+
+    exHC_uses = [j for j in uses if j >= 2]
+    if len(exHC_uses) > 0:
+        E_X_ref = np.stack([E_ref[j - 2] for j in exHC_uses], axis=-1)
+        E_exHC_ref = E_ref[5][..., None]
+
+        # 暖冷房以外の用途の消費量に占める割合 式(66a)～(66e)
+        r_s = np.divide(E_X_ref, E_exHC_ref, out=np.zeros(E_X_ref.shape), where=E_exHC_ref != 0)
+
+        # 換気・照明・給湯・家電・調理の一次エネルギー消費量 式(59)～(63)
+        E_p_exHC = S_exHC[..., None] * r_s * f_PE[..., None]
+        for i, j in enumerate(exHC_uses):
+            E_p[j] = E_p_exHC[..., i]
+
+    return tuple(E_p)
+
+
+def get_IM_batch(
+    htg_use: np.ndarray,
+    clg_use: np.ndarray
+) -> np.ndarray:
+    """各月が中間月か否かの値 (複数世帯の一括計算)
+
+    Args:
+        htg_use (np.ndarray): 暖房を使用しているかの有無, (N, 12)
+        clg_use (np.ndarray): 冷房を使用しているかの有無, (N, 12)
+
+    Returns:
+        np.ndarray: 各月が中間月か否かの値, (N, 12)
+    """
+    return ~htg_use & ~clg_use
@@ -0,0 +1,215 @@
+"""一括計算 (analysis_batch) と世帯ごとの計算 (analysis) の結果がビット単位で一致することの確認
+
+    python3 tests/test_batch.py  (または python3 -m pytest tests)
+
+"""
+import os
+import sys
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+import bunkai
+
+
+sample_filename = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'sample', 'input.csv')
+
+
+def get_random_input(filename: str, N: int = 2000, seed: int = 0, optional_columns: bool = False):
+    """乱数による入力ファイルを作る
+
+    sample/input.csv と同じ列とし、以下の世帯を含める。
+
+    - 月別消費量や調整係数が空欄 (NaN) の世帯 (1月が空欄の世帯を含む)
+    - 月別消費量が 0 の月がある世帯、および年間を通して 0 の世帯
+    - 中間月がない世帯 (すべての月で暖房または冷房を使用)、およびすべての月が中間月の世帯
+
+    optional_columns を指定した場合は、地域の区分と一次エネルギー換算係数の列を加える。
+    地域の区分と電気の換算係数には空欄を含め、ガスと灯油は規定値を使用する世帯と使用しない世帯を含める。
+    ガスと灯油を使用しない世帯は、規定値の使用と換算係数を空欄とする。
+
+    Args:
+        filename (str): 作成する入力ファイル名
+        N (int): 世帯数
+        seed (int): 乱数の種
+        optional_columns (bool): 地域の区分と一次エネルギー換算係数の列を加えるか否か
+
+    """
+    rng = np.random.default_rng(seed)
+    columns = pd.read_csv(sample_filename).columns
+
+    d = {}
+    d[columns[0]] = rng.integers(1, 5, N)
+    d[columns[1]] = np.round(rng.uniform(10, 40, N), 2)
+    d[columns[2]] = np.round(rng.uniform(10, 60, N), 2)
+    d[columns[3]] = np.round(d[columns[1]] + d[columns[2]] + rng.uniform(0, 60, N), 2)
+
+    # 各エネルギー源: 使用の有無, 月別消費量 (12), 暖房 (12), [冷房 (12)]
+    start = 4
+    for p_use, scale, has_cooling in ((0.97, 900, True), (0.6, 100, False), (0.3, 150, False)):
+        use = rng.random(N) < p_use
+        d[columns[start]] = use.astype(int)
+
+        cons = np.round(rng.uniform(0, scale, (N, 12)), 1)
+        cons[rng.random((N, 12)) < 0.1] = 0.0
+        cons[rng.random(N) < 0.05] = 0.0
+        cons[rng.random((N, 12)) < 0.03] = np.nan
+
+        n_flags = 2 if has_cooling else 1
+        flags = (rng.random((n_flags, N, 12)) < 0.4).astype(float)
+        # 中間月がない世帯とすべての月が中間月の世帯
+        kind = rng.random(N)
+        flags[0, kind < 0.15] = 1.0
+        flags[:, kind > 0.9] = 0.0
+
+        for m in range(12):
+            d[columns[start + 1 + m]] = np.where(use, cons[:, m], np.nan)
+        for j in range(n_flags):
+            for m in range(12):
+                d[columns[start + 13 + 12 * j + m]] = np.where(use, flags[j, :, m], np.nan)
+
+        start += 13 + 12 * n_flags
+
+    # 各設備: 使用の有無, 調整係数
+    for j in range(5):
+        d[columns[start + 2 * j]] = (rng.random(N) < 0.8).astype(int)
+        coeff = np.round(rng.uniform(0.5, 1.5, N), 2)
+        coeff[rng.random(N) < 0.02] = np.nan
+        d[columns[start + 2 * j + 1]] = coeff
+
+    d[columns[start + 10]] = np.where(rng.random(N) < 0.7, '都市ガス', 'ＬＰガス')
+
+    if optional_columns:
+        region = rng.integers(1, 9, N).astype(float)
+        region[rng.random(N) < 0.05] = np.nan
+        d['地域の区分'] = region
+
+        f_PE_E = np.round(rng.uniform(8.0, 10.0, N), 2)
+        f_PE_E[rng.random(N) < 0.7] = np.nan
+        d['電気の一次エネルギー換算係数'] = f_PE_E
+
+        for fuel, use, low, high in (('ガス', columns[41], 40.0, 110.0), ('灯油', columns[66], 30.0, 40.0)):
+            use = d[use].astype(bool)
+            use_specified = rng.random(N) < 0.6
+            f_PE = np.round(rng.uniform(low, high, N), 1)
+            # 規定値を使用する世帯の換算係数は、一部のみ記入する (計算には用いない)
+            f_PE[use_specified & (rng.random(N) < 0.8)] = np.nan
+            d[fuel + 'の一次エネルギー換算係数の規定値の使用'] = np.where(
+                use, np.where(use_specified, '使用する', '使用しない'), None)
+            d[fuel + 'の一次エネルギー換算係数'] = np.where(use, f_PE, np.nan)
+
+        columns = columns.append(pd.Index([
+            '地域の区分', '電気の一次エネルギー換算係数',
+            'ガスの一次エネルギー換算係数の規定値の使用', 'ガスの一次エネルギー換算係数',
+            '灯油の一次エネルギー換算係数の規定値の使用', '灯油の一次エネルギー換算係数']))
+
+    pd.DataFrame(d)[columns].to_csv(filename, index=False)
+
+
+def check_batch(filename: str):
+    """一括計算と世帯ごとの計算の結果がビット単位で一致するか確かめる
+
+    NaN は NaN 同士で一致とし、0.0 と -0.0 は区別する。
+
+    Args:
+        filename (str): 入力ファイル名
+
+    """
+    expected = np.array(bunkai.analysis(bunkai.read_csv(filename)), dtype=np.float64)
+    actual = bunkai.analysis_batch(bunkai.read_batch(filename))
+
+    assert actual.shape == expected.shape, (actual.shape, expected.shape)
+
+    same = (actual == expected) & (np.signbit(actual) == np.signbit(expected)) | np.isnan(actual) & np.isnan(expected)
+    if not same.all():
+        rows, cols = np.nonzero(~same)
+        raise AssertionError('{}: {} cells differ (first: row {}, {})'.format(
+            filename, len(rows), rows[0], bunkai.result_columns[cols[0]]))
+
+
+def test_sample():
+    check_batch(sample_filename)
+
+
+def test_random():
+    with tempfile.TemporaryDirectory() as directory:
+        filename = os.path.join(directory, 'input.csv')
+        get_random_input(filename)
+        check_batch(filename)
+
+
+def test_optional_columns():
+    with tempfile.TemporaryDirectory() as directory:
+        filename = os.path.join(directory, 'input.csv')
+        get_random_input(filename, optional_columns=True)
+        check_batch(filename)
+
+        # 空欄の地域の区分は 6 とし、換算係数は規定値を使用しない世帯のみ指定された値とする
+        csv_rows = pd.read_csv(filename)
+        d = bunkai.read_batch(filename)
+
+        assert np.array_equal(d['general']['region'], csv_rows['地域の区分'].fillna(6).astype(int))
+        assert np.array_equal(d['electric']['calorific_value'],
+                              csv_rows['電気の一次エネルギー換算係数'].fillna(9.76))
+
+        use = csv_rows['エネルギー源_都市ガス'].astype(bool)
+        default = np.where(csv_rows['ガスの種類'] == '都市ガス', 45.0, 100.0)
+        expected = np.where(csv_rows['ガスの一次エネルギー換算係数の規定値の使用'] == '使用する',
+                            default, csv_rows['ガスの一次エネルギー換算係数'])
+        assert np.array_equal(d['gas']['calorific_value'], np.where(use, expected, np.nan), equal_nan=True)
+
+        use = csv_rows['エネルギー源_灯油'].astype(bool)
+        expected = np.where(csv_rows['灯油の一次エネルギー換算係数の規定値の使用'] == '使用する',
+                            37.0, csv_rows['灯油の一次エネルギー換算係数'])
+        assert np.array_equal(d['kerosene']['calorific_value'], np.where(use, expected, np.nan), equal_nan=True)
+
+
+def test_invalid_inputs():
+    """使用するエネルギー源の換算係数の指定や地域の区分が不正な場合は ValueError とする"""
+    with tempfile.TemporaryDirectory() as directory:
+        filename = os.path.join(directory, 'input.csv')
+        get_random_input(filename, N=50, optional_columns=True)
+        csv_rows = pd.read_csv(filename)
+
+        gas_user = np.flatnonzero(csv_rows['エネルギー源_都市ガス'] == 1)[0]
+        kerosene_user = np.flatnonzero(csv_rows['エネルギー源_灯油'] == 1)[0]
+        kerosene_non_user = np.flatnonzero(csv_rows['エネルギー源_灯油'] == 0)[0]
+
+        # (行, {列名: 値}, ValueError とするか否か)
+        cases = [
+            (gas_user, {'ガスの一次エネルギー換算係数の規定値の使用': 'はい'}, True),
+            (gas_user, {'ガスの一次エネルギー換算係数の規定値の使用': '使用しない', 'ガスの一次エネルギー換算係数': np.nan}, True),
+            (gas_user, {'ガスの一次エネルギー換算係数の規定値の使用': '使用する', 'ガスの種類': '天然ガス'}, True),
+            (kerosene_user, {'灯油の一次エネルギー換算係数の規定値の使用': 'はい'}, True),
+            (kerosene_user, {'灯油の一次エネルギー換算係数の規定値の使用': '使用しない', '灯油の一次エネルギー換算係数': np.nan}, True),
+            (gas_user, {'地域の区分': 2.5}, True),
+            (gas_user, {'地域の区分': 9}, True),
+            (gas_user, {'世帯の人数': 2.5}, True),
+            # 使用しないエネルギー源の指定は計算に用いないため、検査しない
+            (kerosene_non_user, {'灯油の一次エネルギー換算係数の規定値の使用': 'はい'}, False),
+            (kerosene_non_user, {'灯油の一次エネルギー換算係数の規定値の使用': '使用しない', '灯油の一次エネルギー換算係数': np.nan}, False),
+        ]
+
+        for row, values, invalid in cases:
+            changed = csv_rows.astype(object)
+            for name, value in values.items():
+                changed.loc[row, name] = value
+            changed.to_csv(filename, index=False)
+
+            try:
+                bunkai.analysis_batch(bunkai.read_batch(filename))
+            except ValueError:
+                assert invalid, (row, values)
+            else:
+                assert not invalid, (row, values)
+
+
+if __name__ == '__main__':
+    test_sample()
+    test_random()
+    test_optional_columns()
+    test_invalid_inputs()
+    print('OK')